@@ -0,0 +1,274 @@
+import time
+import statistics
+import random
+from datetime import datetime, timedelta
+from db.Auth import ConnectionPool
+from db.Search import GatorGuidesSearch, SEARCH_POSTS_PER_TUTOR
+from core.ranking import rank_candidates
+from core.config import settings
+
+QUERIES = ["", "CSC", "CSC 210", "MATH", "john", "smith", "zzz"]
+ITERATIONS = 20
+
+def search_multi_query(pool, query):
+    """The original multi-round-trip search, kept here as the baseline the single statement is checked against"""
+    conn = None
+    cursor = None
+    try:
+        conn = pool.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        
+        results = []
+        
+        if not query or query.strip() == '':
+            all_tutors_query = """
+                SELECT 
+                    p.pid, p.tid, p.content, p.timestamp,
+                    tutor.rating, tutor.status,
+                    u.firstName, u.lastName, u.email, u.bio,
+                    tg.tags as post_tag
+                FROM Posts p
+                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                INNER JOIN Tutor tutor ON p.tid = tutor.tid
+                INNER JOIN User u ON tutor.uid = u.uid
+                WHERE tutor.verificationStatus = 'approved'
+                ORDER BY tutor.rating DESC, p.timestamp DESC
+            """
+            cursor.execute(all_tutors_query)
+            posts_by_tag = cursor.fetchall()
+        else:
+            normalized_query = query.replace(' ', '').lower()
+            
+            tag_search_query = """
+                SELECT 
+                    p.pid, p.tid, p.content, p.timestamp,
+                    tutor.rating, tutor.status,
+                    u.firstName, u.lastName, u.email, u.bio,
+                    tg.tags as post_tag
+                FROM Posts p
+                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                INNER JOIN Tutor tutor ON p.tid = tutor.tid
+                INNER JOIN User u ON tutor.uid = u.uid
+                WHERE REPLACE(LOWER(tg.tags), ' ', '') LIKE %s
+                AND tutor.verificationStatus = 'approved'
+                ORDER BY tutor.rating DESC, p.timestamp DESC
+            """
+            cursor.execute(tag_search_query, (f'%{normalized_query}%',))
+            posts_by_tag = cursor.fetchall()
+
+        unique_tids = set()
+        tag_tutor_data = {}
+
+        for post in posts_by_tag:
+            tid = post['tid']
+            unique_tids.add(tid)
+
+            if tid not in tag_tutor_data:
+                tag_tutor_data[tid] = {
+                    'tid': tid,
+                    'name': f"{post['firstName']} {post['lastName']}",
+                    'email': post['email'],
+                    'rating': post['rating'],
+                    'status': post['status'],
+                    'profile_tags': [],
+                    'bio': post['bio'],
+                    'match_type': 'tag',
+                    'posts': [],
+                    'courses': set()
+                }
+
+            tag_tutor_data[tid]['posts'].append({
+                'pid': post['pid'],
+                'course': post['post_tag'],
+                'content': post['content'],
+                'timestamp': post['timestamp'].isoformat() if hasattr(post['timestamp'], 'isoformat') else str(post['timestamp'])
+            })
+            tag_tutor_data[tid]['courses'].add(post['post_tag'])
+
+        if unique_tids:
+            placeholders = ','.join(['%s'] * len(unique_tids))
+            expertise_query = f"""
+                SELECT tt.tid, tg.tags
+                FROM TutorTags tt
+                INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                WHERE tt.tid IN ({placeholders})
+                ORDER BY tt.tid, tg.tags
+            """
+            cursor.execute(expertise_query, tuple(unique_tids))
+            expertise_results = cursor.fetchall()
+
+            for row in expertise_results:
+                tid = row['tid']
+                if tid in tag_tutor_data:
+                    tag_tutor_data[tid]['profile_tags'].append(row['tags'])
+
+        for data in tag_tutor_data.values():
+            data['courses'] = list(data['courses'])
+            results.append(data)
+
+        name_search_query = """
+            SELECT DISTINCT
+                t.tid, t.rating, t.status,
+                u.firstName, u.lastName, u.email, u.bio,
+                CASE 
+                    WHEN u.firstName LIKE %s THEN 1
+                    WHEN u.lastName LIKE %s THEN 2
+                    ELSE 3
+                END as name_priority
+            FROM Tutor t
+            INNER JOIN User u ON t.uid = u.uid
+            WHERE (u.firstName LIKE %s OR u.lastName LIKE %s)
+            AND t.verificationStatus = 'approved'
+            ORDER BY name_priority, u.firstName, u.lastName
+        """
+
+        cursor.execute(name_search_query, (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
+        tutors_by_name = cursor.fetchall()
+
+        name_tids = []
+        name_tutor_data = {}
+
+        for tutor in tutors_by_name:
+            tid = tutor['tid']
+            if tid not in tag_tutor_data:
+                name_tids.append(tid)
+                name_tutor_data[tid] = {
+                    'tid': tid,
+                    'name': f"{tutor['firstName']} {tutor['lastName']}",
+                    'email': tutor['email'],
+                    'rating': tutor['rating'],
+                    'status': tutor['status'],
+                    'profile_tags': [],
+                    'bio': tutor['bio'],
+                    'match_type': 'name',
+                    'posts': [],
+                    'courses': set()
+                }
+
+        if name_tids:
+            placeholders = ','.join(['%s'] * len(name_tids))
+            posts_query = f"""
+                SELECT p.pid, p.tid, p.content, p.timestamp, tg.tags
+                FROM Posts p
+                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                WHERE p.tid IN ({placeholders})
+                ORDER BY p.tid, p.timestamp DESC
+            """
+            cursor.execute(posts_query, tuple(name_tids))
+            posts_results = cursor.fetchall()
+
+            for post in posts_results:
+                tid = post['tid']
+                if tid in name_tutor_data:
+                    name_tutor_data[tid]['posts'].append({
+                        'pid': post['pid'],
+                        'course': post['tags'],
+                        'content': post['content'],
+                        'timestamp': post['timestamp'].isoformat() if hasattr(post['timestamp'], 'isoformat') else str(post['timestamp'])
+                    })
+                    name_tutor_data[tid]['courses'].add(post['tags'])
+
+            expertise_query = f"""
+                SELECT tt.tid, tg.tags
+                FROM TutorTags tt
+                INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                WHERE tt.tid IN ({placeholders})
+                ORDER BY tt.tid, tg.tags
+            """
+            cursor.execute(expertise_query, tuple(name_tids))
+            expertise_results = cursor.fetchall()
+
+            for row in expertise_results:
+                tid = row['tid']
+                if tid in name_tutor_data:
+                    name_tutor_data[tid]['profile_tags'].append(row['tags'])
+
+        for data in name_tutor_data.values():
+            data['courses'] = list(data['courses'])
+            results.append(data)
+
+        return results
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+def time_call(fn, query):
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+def compare_results(pool, search_mgr, query):
+    old = search_multi_query(pool, query)
+    new = search_mgr.search(query, ranked=False)
+
+    old_tids = [r['tid'] for r in old]
+    new_tids = [r['tid'] for r in new]
+    if old_tids != new_tids:
+        print(f"  ✗ Result order differs for '{query}': {old_tids} vs {new_tids}")
+        return False
+
+    for a, b in zip(old, new):
+        if sorted(a['courses']) != sorted(b['courses']) or a['profile_tags'] != b['profile_tags']:
+            print(f"  ✗ Document differs for tid={a['tid']} on '{query}'")
+            return False
+        # Search documents carry only the newest SEARCH_POSTS_PER_TUTOR matching posts
+        if [p['pid'] for p in a['posts'][:SEARCH_POSTS_PER_TUTOR]] != [p['pid'] for p in b['posts']]:
+            print(f"  ✗ Posts differ for tid={a['tid']} on '{query}'")
+            return False
+    return True
+
+def bench_ranking(size=10000):
+    now = datetime.now()
+    candidates = [{
+        'tid': i,
+        'match_type': random.choice(['tag', 'name']),
+        'name_priority': random.randint(1, 3),
+        'rating': round(random.uniform(0, 5), 2),
+        'rating_count': random.randint(0, 200),
+        'last_post': now - timedelta(days=random.randint(0, 365)) if random.random() < 0.9 else None,
+        'status': random.choice(['available', 'away', 'busy'])
+    } for i in range(size)]
+
+    timings = []
+    for _ in range(ITERATIONS):
+        batch = [dict(c) for c in candidates]
+        start = time.perf_counter()
+        rank_candidates(batch, now)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"\nRanking {size} candidates: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+
+def main():
+    print("\n" + "="*50)
+    print("   GatorGuides Search Benchmark")
+    print("="*50)
+
+    pool = ConnectionPool()
+    pool.initialize(
+        host=settings.DATABASE_HOST,
+        database=settings.DATABASE_NAME,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        pool_size=2
+    )
+    search_mgr = GatorGuidesSearch()
+
+    print(f"\n{'query':<12}{'multi (ms)':>14}{'single (ms)':>14}{'speedup':>10}  match")
+    for query in QUERIES:
+        multi_median, _ = time_call(lambda q: search_multi_query(pool, q), query)
+        single_median, _ = time_call(search_mgr.search, query)
+        same = compare_results(pool, search_mgr, query)
+        speedup = multi_median / single_median if single_median else 0
+        print(f"{repr(query):<12}{multi_median:>14.2f}{single_median:>14.2f}{speedup:>9.2f}x  {'✓' if same else '✗'}")
+
+    bench_ranking()
+
+    pool.close_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from typing import Optional, Dict, Any, Iterable, List
+from db.Tutors import GatorGuidesTutors
+
+
+class TutorLoader:
+    """
+    Request-scoped batching for tutor lookups, in the spirit of DataLoader:
+    queue every tid a handler will need, then the first get() fetches them all
+    with one get_tutors call. Records are memoized for the rest of the request.
+    """
+
+    def __init__(self, tutors_mgr: GatorGuidesTutors):
+        self.tutors_mgr = tutors_mgr
+        self._records: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._queued: List[int] = []
+
+    def queue(self, tids: Iterable[int]):
+        self._queued.extend(tid for tid in tids if tid not in self._records)
+
+    def get(self, tid: int) -> Optional[Dict[str, Any]]:
+        if tid not in self._records:
+            self.queue([tid])
+            self.dispatch()
+        return self._records.get(tid)
+
+    def get_many(self, tids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Records for tids in order, skipping any that don't exist"""
+        tids = list(tids)
+        self.queue(tids)
+        self.dispatch()
+        return [self._records[tid] for tid in tids if self._records.get(tid)]
+
+    def dispatch(self):
+        pending = list(dict.fromkeys(tid for tid in self._queued if tid not in self._records))
+        self._queued = []
+        if not pending:
+            return
+
+        found = self.tutors_mgr.get_tutors(pending)
+        for tid in pending:
+            self._records[tid] = found.get(tid)
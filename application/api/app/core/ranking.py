@@ -0,0 +1,97 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from functools import partial
+from operator import eq, itemgetter
+import numpy as np
+
+# Relative weight of each signal in the final relevance score (sums to 1)
+WEIGHTS = {
+    'match': 0.40,
+    'rating': 0.35,
+    'recency': 0.15,
+    'availability': 0.10
+}
+
+# Bayesian prior: a tutor with few ratings is pulled toward PRIOR_RATING
+PRIOR_RATING = 3.5
+PRIOR_WEIGHT = 5.0
+
+# A post this many days old contributes half the recency score of one posted today
+RECENCY_HALF_LIFE_DAYS = 30.0
+
+MATCH_SCORES = {
+    'tag': 1.0,
+    1: 0.8,   # first name hit
+    2: 0.7,   # last name hit
+    3: 0.5    # no query text, listed by name
+}
+
+STATUS_SCORES = {
+    'available': 1.0,
+    'away': 0.5,
+    'busy': 0.0
+}
+
+
+def score_candidates(
+        match_quality: np.ndarray,
+        ratings: np.ndarray,
+        rating_counts: np.ndarray,
+        post_age_days: np.ndarray,
+        availability: np.ndarray
+) -> np.ndarray:
+    """
+    Weighted relevance score for every candidate at once. All inputs are
+    equal-length 1-D arrays; a NaN post age means the tutor has no posts.
+    """
+    adjusted_rating = (PRIOR_WEIGHT * PRIOR_RATING + ratings * rating_counts) / (PRIOR_WEIGHT + rating_counts)
+
+    recency = np.exp2(-np.clip(post_age_days, 0.0, None) / RECENCY_HALF_LIFE_DAYS)
+    recency = np.nan_to_num(recency, nan=0.0)
+
+    return (
+        WEIGHTS['match'] * match_quality
+        + WEIGHTS['rating'] * (adjusted_rating / 5.0)
+        + WEIGHTS['recency'] * recency
+        + WEIGHTS['availability'] * availability
+    )
+
+
+def rank_candidates(candidates: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Sort search candidates by relevance score (highest first) and attach the
+    score to each. Each candidate needs match_type, name_priority, rating,
+    rating_count, last_post and status.
+    """
+    if not candidates:
+        return []
+
+    now = (now or datetime.now()).timestamp()
+    nan = float('nan')
+    count = len(candidates)
+
+    def column(field: str) -> List[Any]:
+        return list(map(itemgetter(field), candidates))
+
+    # Read one field at a time and convert each column in a single call; None in a float column becomes NaN
+    is_tag = np.fromiter(map(partial(eq, 'tag'), column('match_type')), dtype=bool, count=count)
+    name_scores = np.array(list(map(MATCH_SCORES.get, column('name_priority'))), dtype=np.float64)
+    match_quality = np.where(is_tag, MATCH_SCORES['tag'], np.nan_to_num(name_scores, nan=0.5))
+
+    post_times = np.fromiter((p.timestamp() if p else nan for p in column('last_post')), dtype=np.float64, count=count)
+    post_age_days = (now - post_times) / 86400.0
+
+    scores = score_candidates(
+        match_quality,
+        np.nan_to_num(np.array(column('rating'), dtype=np.float64)),
+        np.nan_to_num(np.array(column('rating_count'), dtype=np.float64)),
+        post_age_days,
+        np.nan_to_num(np.array(list(map(STATUS_SCORES.get, column('status'))), dtype=np.float64))
+    )
+    order = np.argsort(-scores, kind='stable')
+    rounded = np.round(scores, 4).tolist()
+
+    # Write scores in input order, while the dicts are still hot from the column reads above
+    for candidate, score in zip(candidates, rounded):
+        candidate['score'] = score
+    return [candidates[index] for index in order.tolist()]
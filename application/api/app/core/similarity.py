@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Tuple, Iterable
+import threading
+import numpy as np
+
+# Neighbors kept per tutor; enough headroom to fill a page after dropping unapproved tutors
+SIMILAR_NEIGHBORS = 25
+
+# Queued expertise changes are re-scored this often (seconds) by a background task
+SIMILARITY_APPLY_SECONDS = 2
+
+# Rows scored per matrix product when rebuilding, bounding the (rows x tutors) scratch array
+BLOCK_ROWS = 1024
+
+
+class TagSimilarityIndex:
+    """
+    Precomputed "tutors with overlapping expertise" lists. Expertise is a
+    tutor x tag incidence matrix; the Jaccard similarity of every pair of
+    tutors comes from one matrix product per block of rows, and only each
+    tutor's top SIMILAR_NEIGHBORS survive. The matrix is held dense because
+    the tag (course) dimension is small; a tutor row is a few hundred bytes.
+
+    update_tutor only queues a change; apply_pending() re-scores off the request
+    path. Writers are serialized by _write_lock, and readers only wait on _lock
+    while finished neighbor lists are swapped in. Like TutorLeaderboard, changes
+    made while a snapshot loads are journaled and replayed once sync() has applied it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Row storage grows by doubling; only the first _size rows are tutors
+        self._size = 0
+        self._tids = np.zeros(0, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._cols: Dict[int, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._neighbors: Dict[int, List[Tuple[int, float]]] = {}
+        self._tags: Dict[int, frozenset] = {}
+        self._pending: Dict[int, List[int]] = {}
+        self._journal: Optional[Dict[int, List[int]]] = None
+        self.loaded = False
+
+    def build(self, tags_by_tutor: Dict[int, Iterable[int]]):
+        """Replace the index with a full snapshot of tid -> tag ids"""
+        with self._write_lock:
+            self._build(tags_by_tutor)
+
+    def _build(self, tags_by_tutor: Dict[int, Iterable[int]]):
+        tids = sorted(tags_by_tutor)
+        tag_ids = sorted({tag_id for tags in tags_by_tutor.values() for tag_id in tags})
+        rows = {tid: i for i, tid in enumerate(tids)}
+        cols = {tag_id: j for j, tag_id in enumerate(tag_ids)}
+
+        matrix = np.zeros((len(tids), len(tag_ids)), dtype=np.float32)
+        for tid, tags in tags_by_tutor.items():
+            matrix[rows[tid], [cols[tag_id] for tag_id in tags]] = 1.0
+
+        tid_array = np.array(tids, dtype=np.int64)
+        neighbors = self._score_rows(matrix, tid_array, np.arange(len(tids)))
+
+        self._size = len(tids)
+        self._tids = tid_array
+        self._rows = rows
+        self._cols = cols
+        self._matrix = matrix
+        self._tags = {tid: frozenset(tags) for tid, tags in tags_by_tutor.items()}
+        with self._lock:
+            self._neighbors = neighbors
+            self.loaded = True
+
+    def begin_sync(self):
+        """Start journaling changes; call before loading the snapshot passed to sync"""
+        with self._lock:
+            self._journal = {}
+
+    def end_sync(self):
+        """Stop journaling; a no-op after sync(), clears the journal if the snapshot load failed"""
+        with self._lock:
+            self._journal = None
+
+    def sync(self, tags_by_tutor: Dict[int, Iterable[int]]):
+        """
+        Bring the index in line with a fresh snapshot: a full build the first time,
+        afterwards only the tutors whose expertise differs are re-scored. Journaled
+        changes are replayed last so the snapshot never overwrites a newer update.
+        """
+        with self._write_lock:
+            if not self.loaded:
+                self._build(tags_by_tutor)
+            else:
+                snapshot = {tid: frozenset(tags) for tid, tags in tags_by_tutor.items()}
+                for tid in self._tags.keys() - snapshot.keys():
+                    self._apply(tid, [])
+                for tid, tags in snapshot.items():
+                    if self._tags.get(tid) != tags:
+                        self._apply(tid, list(tags))
+
+            with self._lock:
+                journal = self._journal or {}
+                self._journal = None
+            for tid, tags in journal.items():
+                self._apply(tid, tags)
+
+    def update_tutor(self, tid: int, tag_ids: Iterable[int]):
+        """Queue a change to one tutor's expertise for the next apply_pending()"""
+        tag_ids = list(tag_ids)
+        with self._lock:
+            if self._journal is not None:
+                self._journal[tid] = tag_ids
+            if self.loaded:
+                self._pending[tid] = tag_ids
+
+    def apply_pending(self) -> int:
+        """Re-score queued changes; run from a background task. Returns how many tutors changed"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for tid, tags in pending.items():
+                self._apply(tid, tags)
+            return len(pending)
+
+    def _apply(self, tid: int, tag_ids: List[int]):
+        """
+        Rewrite one tutor's row in place and re-score every tutor that shared a tag
+        with it before or after; caller holds _write_lock
+        """
+        new_tags = [tag_id for tag_id in dict.fromkeys(tag_ids) if tag_id not in self._cols]
+        if new_tags:
+            for tag_id in new_tags:
+                self._cols[tag_id] = len(self._cols)
+            self._matrix = np.pad(self._matrix, ((0, 0), (0, len(new_tags))))
+
+        row = self._rows.get(tid)
+        if row is None:
+            if self._size == len(self._tids):
+                self._grow()
+            row = self._size
+            self._rows[tid] = row
+            self._tids[row] = tid
+            self._size += 1
+
+        self._tags[tid] = frozenset(tag_ids)
+        matrix = self._matrix[:self._size]
+        touched = matrix[row] > 0
+        matrix[row] = 0.0
+        matrix[row, [self._cols[tag_id] for tag_id in tag_ids]] = 1.0
+        touched |= matrix[row] > 0
+
+        affected = np.flatnonzero(matrix[:, touched].any(axis=1) | (np.arange(self._size) == row))
+        neighbors = self._score_rows(matrix, self._tids[:self._size], affected)
+        with self._lock:
+            self._neighbors.update(neighbors)
+
+    def _grow(self):
+        """Double the row capacity, so adding tutors copies the matrix O(log n) times in total"""
+        capacity = max(2 * len(self._tids), 64)
+        tids = np.zeros(capacity, dtype=np.int64)
+        tids[:self._size] = self._tids[:self._size]
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._tids = tids
+        self._matrix = matrix
+
+    def neighbors(self, tid: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            return list(self._neighbors.get(tid, []))
+
+    @staticmethod
+    def _score_rows(matrix: np.ndarray, tids: np.ndarray, rows: np.ndarray) -> Dict[int, List[Tuple[int, float]]]:
+        """Top neighbors by Jaccard similarity for the given rows against every tutor"""
+        neighbors: Dict[int, List[Tuple[int, float]]] = {}
+        if len(tids) == 0:
+            return neighbors
+
+        degrees = matrix.sum(axis=1)
+        k = min(SIMILAR_NEIGHBORS, len(tids) - 1)
+
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block = rows[start:start + BLOCK_ROWS]
+            overlap = matrix[block] @ matrix.T
+            union = degrees[block, None] + degrees[None, :] - overlap
+            np.maximum(union, 1.0, out=union)
+            scores = np.divide(overlap, union, out=overlap)
+            scores[np.arange(len(block)), block] = 0.0
+
+            if k <= 0:
+                top = np.zeros((len(block), 0), dtype=np.int64)
+            else:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+            for i, row in enumerate(block.tolist()):
+                # Highest score first, ties by tid
+                candidates = top[i][np.lexsort((tids[top[i]], -scores[i, top[i]]))]
+                neighbors[int(tids[row])] = [
+                    (int(tids[j]), round(float(scores[i, j]), 4))
+                    for j in candidates.tolist() if scores[i, j] > 0
+                ]
+
+        return neighbors
@@ -0,0 +1,19 @@
+from typing import Iterator, Dict, Any
+from fastapi.responses import StreamingResponse
+import json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_lines(items: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    try:
+        for item in items:
+            yield json.dumps(item, default=str) + "\n"
+    except Exception as e:
+        # The 200 status is already sent; a final error line tells the client the stream is incomplete
+        yield json.dumps({"error": str(e)}) + "\n"
+
+
+# Streams one JSON document per line as the iterator produces them
+def ndjson_response(items: Iterator[Dict[str, Any]]) -> StreamingResponse:
+    return StreamingResponse(ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE)
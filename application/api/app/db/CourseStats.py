@@ -0,0 +1,51 @@
+from typing import Optional, List
+
+# Incremental maintenance of the CourseStats browse counters. Each helper runs on the
+# caller's cursor so the counters commit or roll back together with the change itself.
+
+
+def adjust_tutor_courses(cursor, tid: int, tutor_delta: int, rating_delta: float, tag_ids: Optional[List[int]] = None):
+    """Shift tutorCount/ratingSum for every course (or just tag_ids) in the tutor's expertise"""
+    query = """
+        UPDATE CourseStats cs
+        INNER JOIN TutorTags tt ON tt.tagsID = cs.tagsID
+        SET cs.tutorCount = cs.tutorCount + %s,
+            cs.ratingSum = cs.ratingSum + %s
+        WHERE tt.tid = %s
+    """
+    params = [tutor_delta, rating_delta, tid]
+
+    if tag_ids is not None:
+        if not tag_ids:
+            return
+        query += f" AND tt.tagsID IN ({','.join(['%s'] * len(tag_ids))})"
+        params.extend(tag_ids)
+
+    cursor.execute(query, tuple(params))
+
+
+def adjust_course_posts(cursor, tags_id: int, delta: int):
+    """Shift postCount for a single course"""
+    cursor.execute(
+        "UPDATE CourseStats SET postCount = postCount + %s WHERE tagsID = %s",
+        (delta, tags_id)
+    )
+
+
+def adjust_courses_for_tutors(cursor, tids: List[int], sign: int):
+    """Add (sign=1) or remove (sign=-1) a batch of tutors from every course in their expertise"""
+    if not tids:
+        return
+
+    cursor.execute(f"""
+        UPDATE CourseStats cs
+        INNER JOIN (
+            SELECT tt.tagsID, COUNT(*) AS tutors, SUM(t.rating) AS rating_sum
+            FROM TutorTags tt
+            INNER JOIN Tutor t ON t.tid = tt.tid
+            WHERE tt.tid IN ({','.join(['%s'] * len(tids))})
+            GROUP BY tt.tagsID
+        ) d ON d.tagsID = cs.tagsID
+        SET cs.tutorCount = cs.tutorCount + %s * d.tutors,
+            cs.ratingSum = cs.ratingSum + %s * d.rating_sum
+    """, (*tids, sign, sign))
@@ -250,4 +250,117 @@ INSERT INTO Posts (tid, tagsID, content, timestamp) VALUES
 
 -- Brandon Lewis (tid=25) - Discrete Math
 (25, 7, 'Graph theory: paths, cycles, trees, and graph coloring problems.', '2024-11-02 18:00:00'),
-(25, 7, 'Number theory and cryptography basics. Modular arithmetic and RSA algorithm.', '2024-11-06 16:00:00');
\ No newline at end of file
+(25, 7, 'Number theory and cryptography basics. Modular arithmetic and RSA algorithm.', '2024-11-06 16:00:00');
+
+-- Completed sessions, one per tutor, so each seeded rating below has a session behind it
+INSERT INTO Sessions (tid, uid, tagsID, day, time, location, started, concluded) VALUES
+(1, 26, 3, 'Monday', 10, 'Zoom', '2024-10-07 10:00:00', '2024-10-07 11:00:00'),
+(2, 27, 1, 'Tuesday', 11, 'Zoom', '2024-10-08 11:00:00', '2024-10-08 12:00:00'),
+(3, 28, 3, 'Wednesday', 12, 'Zoom', '2024-10-09 12:00:00', '2024-10-09 13:00:00'),
+(4, 29, 8, 'Thursday', 13, 'Zoom', '2024-10-10 13:00:00', '2024-10-10 14:00:00'),
+(5, 30, 7, 'Friday', 14, 'Zoom', '2024-10-11 14:00:00', '2024-10-11 15:00:00'),
+(6, 32, 13, 'Monday', 15, 'Zoom', '2024-10-07 15:00:00', '2024-10-07 16:00:00'),
+(7, 33, 11, 'Tuesday', 16, 'Zoom', '2024-10-08 16:00:00', '2024-10-08 17:00:00'),
+(8, 34, 1, 'Wednesday', 17, 'Zoom', '2024-10-09 17:00:00', '2024-10-09 18:00:00'),
+(9, 26, 6, 'Thursday', 10, 'Zoom', '2024-10-10 10:00:00', '2024-10-10 11:00:00'),
+(10, 27, 15, 'Friday', 11, 'Zoom', '2024-10-11 11:00:00', '2024-10-11 12:00:00'),
+(11, 28, 3, 'Monday', 12, 'Zoom', '2024-10-14 12:00:00', '2024-10-14 13:00:00'),
+(12, 29, 19, 'Tuesday', 13, 'Zoom', '2024-10-15 13:00:00', '2024-10-15 14:00:00'),
+(13, 30, 14, 'Wednesday', 14, 'Zoom', '2024-10-16 14:00:00', '2024-10-16 15:00:00'),
+(14, 32, 8, 'Thursday', 15, 'Zoom', '2024-10-17 15:00:00', '2024-10-17 16:00:00'),
+(15, 33, 5, 'Friday', 16, 'Zoom', '2024-10-18 16:00:00', '2024-10-18 17:00:00'),
+(16, 34, 1, 'Monday', 17, 'Zoom', '2024-10-14 17:00:00', '2024-10-14 18:00:00'),
+(17, 26, 4, 'Tuesday', 10, 'Zoom', '2024-10-15 10:00:00', '2024-10-15 11:00:00'),
+(18, 27, 3, 'Wednesday', 11, 'Zoom', '2024-10-16 11:00:00', '2024-10-16 12:00:00'),
+(19, 28, 17, 'Thursday', 12, 'Zoom', '2024-10-17 12:00:00', '2024-10-17 13:00:00'),
+(20, 29, 2, 'Friday', 13, 'Zoom', '2024-10-18 13:00:00', '2024-10-18 14:00:00'),
+(21, 30, 6, 'Monday', 14, 'Zoom', '2024-10-21 14:00:00', '2024-10-21 15:00:00'),
+(22, 32, 18, 'Tuesday', 15, 'Zoom', '2024-10-22 15:00:00', '2024-10-22 16:00:00'),
+(23, 33, 5, 'Wednesday', 16, 'Zoom', '2024-10-23 16:00:00', '2024-10-23 17:00:00'),
+(24, 34, 15, 'Thursday', 17, 'Zoom', '2024-10-24 17:00:00', '2024-10-24 18:00:00'),
+(25, 26, 7, 'Friday', 10, 'Zoom', '2024-10-25 10:00:00', '2024-10-25 11:00:00');
+
+-- Insert Ratings (sid n is tutor n's session above); each matches the tutor's seeded rating
+INSERT INTO Ratings (tid, uid, sid, rating, timestamp) VALUES
+(1, 26, 1, 4.8, '2024-10-07 11:05:00'),
+(2, 27, 2, 4.5, '2024-10-08 12:05:00'),
+(3, 28, 3, 4.9, '2024-10-09 13:05:00'),
+(4, 29, 4, 4.7, '2024-10-10 14:05:00'),
+(5, 30, 5, 4.3, '2024-10-11 15:05:00'),
+(6, 32, 6, 4.6, '2024-10-07 16:05:00'),
+(7, 33, 7, 4.4, '2024-10-08 17:05:00'),
+(8, 34, 8, 4.8, '2024-10-09 18:05:00'),
+(9, 26, 9, 4.2, '2024-10-10 11:05:00'),
+(10, 27, 10, 4.9, '2024-10-11 12:05:00'),
+(11, 28, 11, 4.5, '2024-10-14 13:05:00'),
+(12, 29, 12, 4.7, '2024-10-15 14:05:00'),
+(13, 30, 13, 4.6, '2024-10-16 15:05:00'),
+(14, 32, 14, 4.8, '2024-10-17 16:05:00'),
+(15, 33, 15, 4.4, '2024-10-18 17:05:00'),
+(16, 34, 16, 4.9, '2024-10-14 18:05:00'),
+(17, 26, 17, 4.3, '2024-10-15 11:05:00'),
+(18, 27, 18, 4.7, '2024-10-16 12:05:00'),
+(19, 28, 19, 4.5, '2024-10-17 13:05:00'),
+(20, 29, 20, 4.8, '2024-10-18 14:05:00'),
+(21, 30, 21, 4.6, '2024-10-21 15:05:00'),
+(22, 32, 22, 4.4, '2024-10-22 16:05:00'),
+(23, 33, 23, 4.7, '2024-10-23 17:05:00'),
+(24, 34, 24, 4.9, '2024-10-24 18:05:00'),
+(25, 26, 25, 4.5, '2024-10-25 11:05:00');
+
+-- Seed the stored rating aggregates and histogram from Ratings, as migrations 003 and 006 do
+UPDATE Tutor t
+    INNER JOIN (SELECT tid, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+                FROM Ratings
+                GROUP BY tid) r ON r.tid = t.tid
+SET t.ratingSum   = r.rating_sum,
+    t.ratingCount = r.rating_count;
+
+INSERT INTO RatingHistogram (tid, bucket, bucketCount)
+SELECT tid, FLOOR(rating * 2), COUNT(*)
+FROM Ratings
+GROUP BY tid, FLOOR(rating * 2);
+
+-- Insert Messages between students and the tutors they met with
+INSERT INTO Messages (senderUID, receiverUID, content, timestamp) VALUES
+(26, 1, 'Hi John, could we go over binary search trees again before the midterm?', '2024-10-12 09:15:00'),
+(1, 26, 'Of course! Bring the practice problems and we can work through deletions.', '2024-10-12 10:02:00'),
+(27, 2, 'Thanks for the session on loops, it finally clicked.', '2024-10-09 18:30:00'),
+(2, 27, 'Glad to hear it! Try the nested loop exercises next.', '2024-10-09 19:10:00'),
+(28, 3, 'Do you have time this week for Big-O analysis?', '2024-10-13 14:45:00');
+
+-- Seed conversation summaries and unread totals from Messages, as migrations 010 and 011 do;
+-- seeded history starts out read
+INSERT INTO Conversations (uid, otherUID, lastMID, lastSenderUID, lastContent, lastTimestamp, unreadCount, lastReadMID)
+SELECT last.uid, last.otherUID, m.mid, m.senderUID, LEFT(m.content, 200), m.timestamp, 0, m.mid
+FROM (
+    SELECT sides.uid, sides.otherUID, MAX(sides.mid) AS mid
+    FROM (
+        SELECT senderUID AS uid, receiverUID AS otherUID, mid FROM Messages
+        UNION ALL
+        SELECT receiverUID AS uid, senderUID AS otherUID, mid FROM Messages
+    ) sides
+    GROUP BY sides.uid, sides.otherUID
+) last
+INNER JOIN Messages m ON m.mid = last.mid;
+
+INSERT INTO UnreadCounts (uid, total)
+SELECT uid, SUM(unreadCount)
+FROM Conversations
+GROUP BY uid
+HAVING SUM(unreadCount) > 0;
+
+-- Seed the browse counters from the rows above (the API keeps them current afterwards)
+INSERT INTO CourseStats (tagsID, tutorCount, postCount, ratingSum)
+SELECT
+    tg.tagsID,
+    (SELECT COUNT(*)
+     FROM TutorTags tt
+              INNER JOIN Tutor t ON tt.tid = t.tid
+     WHERE tt.tagsID = tg.tagsID AND t.verificationStatus = 'approved'),
+    (SELECT COUNT(*) FROM Posts p WHERE p.tagsID = tg.tagsID),
+    (SELECT COALESCE(SUM(COALESCE(t.rating, 0)), 0)
+     FROM TutorTags tt
+              INNER JOIN Tutor t ON tt.tid = t.tid
+     WHERE tt.tagsID = tg.tagsID AND t.verificationStatus = 'approved')
+FROM Tags tg;
@@ -0,0 +1,128 @@
+from typing import Optional, Dict, Any, List, Tuple
+from bisect import bisect_left, insort
+import threading
+import time
+
+# Same bucket order as Tutor.listingRank: approved, pending, unapproved
+LISTING_RANKS = {'approved': 0, 'pending': 1}
+
+# Workers reload the leaderboard from MySQL this often so writes made by other processes show up
+LEADERBOARD_RECONCILE_SECONDS = 60
+
+
+def leaderboard_key(tutor: Dict[str, Any]) -> Tuple[int, float, int]:
+    return LISTING_RANKS.get(tutor['verificationStatus'], 2), -float(tutor['rating']), tutor['tid']
+
+
+class TutorLeaderboard:
+    """
+    Process-wide, in-memory tutor ranking in get_top_tutors order, overall and
+    per course. Each board is a sorted list of (listingRank, -rating, tid) keys,
+    so top-N is a slice. Rating and verification changes move single keys;
+    reconcile() swaps in a fresh snapshot from MySQL and replays any changes
+    that were applied while the snapshot loaded.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self._board_lock = threading.Lock()
+        self._tutors: Dict[int, Dict[str, Any]] = {}
+        self._overall: List[Tuple[int, float, int]] = []
+        self._by_course: Dict[int, List[Tuple[int, float, int]]] = {}
+        self._journal: Optional[List[Tuple[int, Dict[str, Any]]]] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def top(self, limit: int, tags_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._board_lock:
+            board = self._overall if tags_id is None else self._by_course.get(tags_id, [])
+            return [dict(self._tutors[key[2]]) for key in board[:limit]]
+
+    def begin_reconcile(self):
+        """Start journaling changes; call before loading the snapshot passed to reconcile"""
+        with self._board_lock:
+            self._journal = []
+
+    def end_reconcile(self):
+        """Stop journaling; a no-op after reconcile(), clears the journal if the snapshot load failed"""
+        with self._board_lock:
+            self._journal = None
+
+    def reconcile(self, tutors: List[Dict[str, Any]]):
+        """Replace every board with tutors (get_all_tutors documents), then replay journaled changes"""
+        overall = []
+        by_course: Dict[int, List[Tuple[int, float, int]]] = {}
+        for tutor in tutors:
+            key = leaderboard_key(tutor)
+            overall.append(key)
+            for tag in tutor['tags']:
+                by_course.setdefault(tag['id'], []).append(key)
+
+        overall.sort()
+        for board in by_course.values():
+            board.sort()
+
+        with self._board_lock:
+            journal = self._journal or []
+            self._journal = None
+            self._tutors = {tutor['tid']: tutor for tutor in tutors}
+            self._overall = overall
+            self._by_course = by_course
+            self.loaded_at = time.monotonic()
+
+            for tid, fields in journal:
+                self._apply(tid, fields)
+
+    def update(self, tid: int, **fields):
+        """Apply a committed change to rating, verificationStatus, tags or any display field"""
+        with self._board_lock:
+            if self._journal is not None:
+                self._journal.append((tid, fields))
+            self._apply(tid, fields)
+
+    def add(self, tutor: Dict[str, Any]):
+        with self._board_lock:
+            if self._journal is not None:
+                self._journal.append((tutor['tid'], dict(tutor)))
+            self._apply(tutor['tid'], dict(tutor))
+
+    def _apply(self, tid: int, fields: Dict[str, Any]):
+        tutor = self._tutors.get(tid)
+        if tutor is None:
+            if 'verificationStatus' not in fields or 'rating' not in fields:
+                # Unknown tutor and not enough to rank it; the next reconcile picks it up
+                return
+            tutor = {'tid': tid, 'tags': []}
+            self._tutors[tid] = tutor
+        else:
+            self._remove_key(tutor)
+
+        tutor.update(fields)
+        key = leaderboard_key(tutor)
+        insort(self._overall, key)
+        for tag in tutor['tags']:
+            insort(self._by_course.setdefault(tag['id'], []), key)
+
+    def _remove_key(self, tutor: Dict[str, Any]):
+        key = leaderboard_key(tutor)
+        self._discard(self._overall, key)
+        for tag in tutor['tags']:
+            self._discard(self._by_course.get(tag['id'], []), key)
+
+    @staticmethod
+    def _discard(board: List[Tuple[int, float, int]], key: Tuple[int, float, int]):
+        index = bisect_left(board, key)
+        if index < len(board) and board[index] == key:
+            del board[index]
@@ -5,6 +5,14 @@ from db.Auth import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Characters of the last message kept in Conversations for the inbox preview
+CONVERSATION_PREVIEW_LENGTH = 200
+
+
+def conversation_key(uid1: int, uid2: int) -> int:
+    """Messages.convKey for the conversation between two users, in either direction"""
+    return min(uid1, uid2) * 4294967296 + max(uid1, uid2)
+
 
 class GatorGuidesMessages:
     def __init__(self):
@@ -44,6 +52,11 @@ class GatorGuidesMessages:
                 conn.close()
 
     def send_message(self, sender_uid: int, receiver_uid: int, content: str) -> Optional[Dict[str, Any]]:
+        if sender_uid == receiver_uid:
+            # Both inbox sides would be the same row, counting the sender's own message as unread
+            logger.warning(f"Rejected message from user {sender_uid} to themselves")
+            return None
+
         conn = None
         cursor = None
         try:
@@ -58,6 +71,38 @@ class GatorGuidesMessages:
             
             cursor.execute(query, (sender_uid, receiver_uid, content))
             message_id = cursor.lastrowid
+
+            # Both sides' inbox rows, in the same transaction; only the receiver gains an unread message.
+            # lastMID is assigned last so the IFs still compare against the stored value.
+            summary_query = """
+                INSERT INTO Conversations (uid, otherUID, lastMID, lastSenderUID, lastContent, lastTimestamp, unreadCount)
+                SELECT side.uid, side.otherUID, m.mid, m.senderUID, LEFT(m.content, %s), m.timestamp, side.unread
+                FROM Messages m
+                INNER JOIN (
+                    SELECT %s AS uid, %s AS otherUID, 0 AS unread
+                    UNION ALL
+                    SELECT %s, %s, 1
+                ) side
+                WHERE m.mid = %s
+                ON DUPLICATE KEY UPDATE
+                    unreadCount = unreadCount + VALUES(unreadCount),
+                    lastSenderUID = IF(VALUES(lastMID) > lastMID, VALUES(lastSenderUID), lastSenderUID),
+                    lastContent = IF(VALUES(lastMID) > lastMID, VALUES(lastContent), lastContent),
+                    lastTimestamp = IF(VALUES(lastMID) > lastMID, VALUES(lastTimestamp), lastTimestamp),
+                    lastMID = GREATEST(lastMID, VALUES(lastMID))
+            """
+            cursor.execute(summary_query, (
+                CONVERSATION_PREVIEW_LENGTH,
+                sender_uid, receiver_uid,
+                receiver_uid, sender_uid,
+                message_id
+            ))
+
+            cursor.execute("""
+                INSERT INTO UnreadCounts (uid, total)
+                VALUES (%s, 1)
+                ON DUPLICATE KEY UPDATE total = total + 1
+            """, (receiver_uid,))
             
             conn.commit()
 
@@ -98,13 +143,19 @@ class GatorGuidesMessages:
             if conn:
                 conn.close()
 
-    def get_conversation(self, uid1: int, uid2: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_conversation(self, uid1: int, uid2: int, limit: int = 50, offset: int = 0, before_mid: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        The latest limit messages between two users, oldest first. Pass the smallest
+        mid already loaded as before_mid to page back; that reads one range of
+        idx_messages_conversation at any depth, whereas offset is kept for old clients.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
+            params: List[Any] = [conversation_key(uid1, uid2)]
             query = """
                 SELECT 
                     m.mid, m.senderUID, m.receiverUID, m.content, m.timestamp,
@@ -112,15 +163,21 @@ class GatorGuidesMessages:
                     u.lastName as sender_last_name
                 FROM Messages m
                 INNER JOIN User u ON m.senderUID = u.uid
-                WHERE 
-                    (m.senderUID = %s AND m.receiverUID = %s)
-                    OR 
-                    (m.senderUID = %s AND m.receiverUID = %s)
-                ORDER BY m.timestamp DESC
-                LIMIT %s OFFSET %s
+                WHERE m.convKey = %s
             """
+
+            if before_mid is not None:
+                query += " AND m.mid < %s"
+                params.append(before_mid)
+
+            query += " ORDER BY m.mid DESC LIMIT %s"
+            params.append(limit)
+
+            if before_mid is None and offset:
+                query += " OFFSET %s"
+                params.append(offset)
             
-            cursor.execute(query, (uid1, uid2, uid2, uid1, limit, offset))
+            cursor.execute(query, tuple(params))
             messages = cursor.fetchall()
             
             results = []
@@ -146,6 +203,10 @@ class GatorGuidesMessages:
                 conn.close()
 
     def get_recent_conversations(self, uid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        The user's most recent conversations from the Conversations summary rows,
+        newest first; lastMessage is a preview of up to CONVERSATION_PREVIEW_LENGTH characters.
+        """
         conn = None
         cursor = None
         try:
@@ -154,31 +215,21 @@ class GatorGuidesMessages:
             
             query = """
                 SELECT 
-                    CASE 
-                        WHEN m.senderUID = %s THEN m.receiverUID
-                        ELSE m.senderUID
-                    END as other_uid,
+                    c.otherUID as other_uid,
                     u.firstName,
                     u.lastName,
-                    MAX(m.timestamp) as last_message_time,
-                    (SELECT content 
-                     FROM Messages m2 
-                     WHERE (m2.senderUID = %s AND m2.receiverUID = other_uid)
-                        OR (m2.receiverUID = %s AND m2.senderUID = other_uid)
-                     ORDER BY m2.timestamp DESC 
-                     LIMIT 1) as last_message
-                FROM Messages m
-                INNER JOIN User u ON u.uid = CASE 
-                    WHEN m.senderUID = %s THEN m.receiverUID
-                    ELSE m.senderUID
-                END
-                WHERE m.senderUID = %s OR m.receiverUID = %s
-                GROUP BY other_uid, u.firstName, u.lastName
-                ORDER BY last_message_time DESC
+                    c.lastTimestamp as last_message_time,
+                    c.lastContent as last_message,
+                    c.unreadCount,
+                    c.lastReadMID
+                FROM Conversations c
+                INNER JOIN User u ON u.uid = c.otherUID
+                WHERE c.uid = %s
+                ORDER BY c.lastMID DESC
                 LIMIT %s
             """
             
-            cursor.execute(query, (uid, uid, uid, uid, uid, uid, limit))
+            cursor.execute(query, (uid, limit))
             conversations = cursor.fetchall()
             
             results = []
@@ -187,6 +238,8 @@ class GatorGuidesMessages:
                     'otherUID': conv['other_uid'],
                     'otherName': f"{conv['firstName']} {conv['lastName']}",
                     'lastMessage': conv['last_message'],
+                    'unreadCount': conv['unreadCount'],
+                    'lastReadMID': conv['lastReadMID'],
                     'lastMessageTime': conv['last_message_time'].isoformat() if isinstance(conv['last_message_time'], datetime) else str(conv['last_message_time'])
                 })
             
@@ -199,4 +252,26 @@ class GatorGuidesMessages:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def get_unread_total(self, uid: int) -> int:
+        """Unread messages across all of the user's conversations, for the inbox badge"""
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            cursor.execute("SELECT total FROM UnreadCounts WHERE uid = %s", (uid,))
+            result = cursor.fetchone()
+
+            return result['total'] if result else 0
+
+        except Exception as e:
+            logger.error(f"Get unread total error: {e}", exc_info=True)
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
@@ -1,48 +1,104 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
+import base64
+import json
+import threading
+import time
 import logging
 from db.Auth import ConnectionPool
+from db.CourseStats import adjust_course_posts
+from db.TutorCache import TutorCache
+import mysql.connector
 
 logger = logging.getLogger(__name__)
 
+# Page size of the post feed; only the first page (per tag filter) is cached
+FEED_PAGE_SIZE = 20
+
+# Cached head pages are dropped on any post write or tutor verification change in this worker,
+# and after this long for other workers' writes
+FEED_CACHE_TTL = 30
+
 
 class GatorGuidesPosts:
+    # Cached first feed pages are shared across instances so tutor writes can invalidate them
+    _feed_lock = threading.Lock()
+    _feed_head: Dict[Optional[int], Tuple[float, Dict[str, Any]]] = {}
+    _feed_generation = 0
+
     def __init__(self):
         self.pool = ConnectionPool()
+        self.tutor_cache = TutorCache()
+        # Course names by tagsID; tags are only ever added, so entries never go stale
+        self._tag_names: Dict[int, str] = {}
     
     def _get_connection(self):
         return self.pool.get_connection()
 
     def create_post(self, tid: int, tags_id: int, content: str) -> Optional[Dict[str, Any]]:
+        """
+        Insert a post and return it without re-reading it. The FKs on Posts reject an
+        unknown tutor or tag, and the display fields come from the tutor cache and the
+        tag name cache. Costs four round trips on one connection: the database clock
+        read (folded into the display lookup on a cache miss), the INSERT, the
+        CourseStats update and the COMMIT.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
-            
-            tutor_check = "SELECT tid FROM Tutor WHERE tid = %s"
-            cursor.execute(tutor_check, (tid,))
-            if not cursor.fetchone():
-                logger.error(f"Tutor {tid} does not exist")
-                return None
-
-            tag_check = "SELECT tagsID FROM Tags WHERE tagsID = %s"
-            cursor.execute(tag_check, (tags_id,))
-            if not cursor.fetchone():
-                logger.error(f"Tag {tags_id} does not exist")
-                return None
+
+            # Stamp the post with the database clock, which the feed cursor compares against
+            tutor = self.tutor_cache.get(tid)
+            course = self._tag_names.get(tags_id)
+            if tutor is None or course is None:
+                lookup = """
+                    SELECT NOW() AS now, u.firstName, u.lastName, t.rating, tg.tags
+                    FROM Tutor t
+                    INNER JOIN User u ON t.uid = u.uid
+                    INNER JOIN Tags tg ON tg.tagsID = %s
+                    WHERE t.tid = %s
+                """
+                cursor.execute(lookup, (tags_id, tid))
+                row = cursor.fetchone()
+                if not row:
+                    logger.error(f"Tutor {tid} or tag {tags_id} does not exist")
+                    return None
+                tutor = {'name': f"{row['firstName']} {row['lastName']}", 'rating': row['rating']}
+                course = self._tag_names[tags_id] = row['tags']
+            else:
+                cursor.execute("SELECT NOW() AS now")
+                row = cursor.fetchone()
+            timestamp = row['now']
 
             query = """
                 INSERT INTO Posts (tid, tagsID, content, timestamp)
-                VALUES (%s, %s, %s, NOW())
+                VALUES (%s, %s, %s, %s)
             """
             
-            cursor.execute(query, (tid, tags_id, content))
-            conn.commit()
+            cursor.execute(query, (tid, tags_id, content, timestamp))
             post_id = cursor.lastrowid
+            adjust_course_posts(cursor, tags_id, 1)
+            conn.commit()
+            self.invalidate_feed()
 
-            return self.get_post(post_id)
+            return {
+                'pid': post_id,
+                'tid': tid,
+                'tutorName': tutor['name'],
+                'rating': tutor['rating'],
+                'course': course,
+                'tagsID': tags_id,
+                'content': content,
+                'timestamp': timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+            }
 
+        except mysql.connector.IntegrityError as e:
+            logger.error(f"Tutor {tid} or tag {tags_id} does not exist: {e}")
+            if conn:
+                conn.rollback()
+            return None
         except Exception as e:
             logger.error(f"Create post error: {e}", exc_info=True)
             if conn:
@@ -101,28 +157,135 @@ class GatorGuidesPosts:
             if conn:
                 conn.close()
     
-    def get_tutor_id_from_post(self, pid: int) -> Optional[int]:
+    @staticmethod
+    def encode_feed_cursor(post: Dict[str, Any]) -> str:
+        key = json.dumps([post['timestamp'], post['pid']])
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_feed_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            timestamp, pid = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(timestamp), int(pid)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    def invalidate_feed(cls):
+        """Drop the cached first feed pages; call after any write that changes what the feed shows"""
+        with cls._feed_lock:
+            cls._feed_generation += 1
+            cls._feed_head.clear()
+
+    def _feed_statement(self, limit: int, after: Optional[str] = None, tags_id: Optional[int] = None) -> Tuple[str, Tuple[Any, ...]]:
+        """Feed page query and params; raises ValueError on a bad cursor"""
+        conditions = ["t.verificationStatus = 'approved'"]
+        params: List[Any] = []
+
+        if tags_id is not None:
+            conditions.append("p.tagsID = %s")
+            params.append(tags_id)
+
+        if after:
+            timestamp, pid = self.decode_feed_cursor(after)
+            conditions.append("(p.timestamp < %s OR (p.timestamp = %s AND p.pid < %s))")
+            params.extend([timestamp, timestamp, pid])
+
+        # One extra row tells us whether another page exists
+        query = f"""
+            SELECT 
+                p.pid, p.tid, p.tagsID, p.content, p.timestamp,
+                u.firstName, u.lastName,
+                t.rating,
+                tg.tags as course
+            FROM Posts p
+            INNER JOIN Tutor t ON p.tid = t.tid
+            INNER JOIN User u ON t.uid = u.uid
+            INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+            WHERE {' AND '.join(conditions)}
+            ORDER BY p.timestamp DESC, p.pid DESC
+            LIMIT %s
+        """
+        params.append(limit + 1)
+        return query, tuple(params)
+
+    def get_feed(self, limit: int = FEED_PAGE_SIZE, after: Optional[str] = None, tags_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Newest posts from approved tutors, optionally for one course, keyset-paginated
+        on (timestamp DESC, pid DESC). Pass the returned nextCursor as after to continue;
+        it is None on the last page. The default first page is served from memory.
+        Raises ValueError on a bad cursor.
+        """
+        head = after is None and limit == FEED_PAGE_SIZE
+        if head:
+            with self._feed_lock:
+                generation = self._feed_generation
+                cached = self._feed_head.get(tags_id)
+                if cached and time.monotonic() - cached[0] <= FEED_CACHE_TTL:
+                    return cached[1]
+
+        query, params = self._feed_statement(limit, after, tags_id)
+
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
-            
-            query = "SELECT tid FROM Posts WHERE pid = %s"
-            cursor.execute(query, (pid,))
-            result = cursor.fetchone()
-            
-            return result['tid'] if result else None
+
+            cursor.execute(query, params)
+            posts = cursor.fetchall()
+
+            has_more = len(posts) > limit
+            results = [
+                {
+                    'pid': post['pid'],
+                    'tid': post['tid'],
+                    'tutorName': f"{post['firstName']} {post['lastName']}",
+                    'rating': post['rating'],
+                    'course': post['course'],
+                    'tagsID': post['tagsID'],
+                    'content': post['content'],
+                    'timestamp': post['timestamp'].isoformat() if isinstance(post['timestamp'], datetime) else str(post['timestamp'])
+                }
+                for post in posts[:limit]
+            ]
+
+            page = {
+                'posts': results,
+                'nextCursor': self.encode_feed_cursor(results[-1]) if has_more else None
+            }
+
+            if head:
+                with self._feed_lock:
+                    # A post written while this page loaded makes it stale before it is cached
+                    if generation == self._feed_generation:
+                        self._feed_head[tags_id] = (time.monotonic(), page)
+
+            return page
 
         except Exception as e:
-            logger.error(f"Get tutor from post error: {e}", exc_info=True)
+            logger.error(f"Get feed error: {e}", exc_info=True)
             return None
         finally:
             if cursor:
                 cursor.close()
             if conn:
                 conn.close()
-        
+
+    def _tutor_posts_statement(self, tid: int, limit: int) -> Tuple[str, Tuple[Any, ...]]:
+        query = """
+            SELECT 
+                p.pid, p.tid, p.tagsID, p.content, p.timestamp,
+                tg.tags as course
+            FROM Posts p
+            INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+            WHERE p.tid = %s
+            ORDER BY p.timestamp DESC
+            LIMIT %s
+        """
+        return query, (tid, limit)
+
     def get_posts_by_tutor(self, tid: int, limit: int = 50) -> List[Dict[str, Any]]:
         conn = None
         cursor = None
@@ -130,18 +293,8 @@ class GatorGuidesPosts:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
-            query = """
-                SELECT 
-                    p.pid, p.tid, p.tagsID, p.content, p.timestamp,
-                    tg.tags as course
-                FROM Posts p
-                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
-                WHERE p.tid = %s
-                ORDER BY p.timestamp DESC
-                LIMIT %s
-            """
-            
-            cursor.execute(query, (tid, limit))
+            query, params = self._tutor_posts_statement(tid, limit)
+            cursor.execute(query, params)
             posts = cursor.fetchall()
 
             results = []
@@ -166,77 +319,136 @@ class GatorGuidesPosts:
             if conn:
                 conn.close()
 
-    def update_post(self, pid: int, content: Optional[str] = None, tags_id: Optional[int] = None) -> bool:
+    def _post_owner_outcome(self, cursor, pid: int, uid: int) -> str:
+        """Why an ownership-filtered write touched nothing: 'not_found', 'forbidden', or 'unchanged'"""
+        cursor.execute("""
+            SELECT t.uid
+            FROM Posts p
+            INNER JOIN Tutor t ON p.tid = t.tid
+            WHERE p.pid = %s
+        """, (pid,))
+        owner = cursor.fetchone()
+        if not owner:
+            return 'not_found'
+        return 'forbidden' if owner['uid'] != uid else 'unchanged'
+
+    def update_own_post(self, pid: int, uid: int, content: Optional[str] = None, tags_id: Optional[int] = None) -> Optional[str]:
+        """
+        Update a post only if user uid owns it, with the ownership check inside the
+        write itself. Returns 'updated', 'unchanged', 'not_found', 'forbidden' or
+        'invalid_tag', or None on error.
+        """
+        if content is None and tags_id is None:
+            logger.warning("No fields to update")
+            return 'unchanged'
+
         conn = None
         cursor = None
         try:
-            updates = []
-            values = []
-
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
 
+            old_tags_id = None
+            if tags_id is not None:
+                # The old course is needed for CourseStats; lock the row only if the caller owns it
+                cursor.execute("""
+                    SELECT p.tagsID
+                    FROM Posts p
+                    INNER JOIN Tutor t ON p.tid = t.tid
+                    WHERE p.pid = %s AND t.uid = %s
+                    FOR UPDATE
+                """, (pid, uid))
+                current = cursor.fetchone()
+                if not current:
+                    return self._post_owner_outcome(cursor, pid, uid)
+                old_tags_id = current['tagsID']
+
+            updates = []
+            values: List[Any] = []
             if content is not None:
-                updates.append("content = %s")
+                updates.append("p.content = %s")
                 values.append(content)
-            
             if tags_id is not None:
-                tag_check = "SELECT tagsID FROM Tags WHERE tagsID = %s"
-                cursor.execute(tag_check, (tags_id,))
-                if not cursor.fetchone():
-                    logger.error(f"Tag {tags_id} does not exist")
-                    return False
-                
-                updates.append("tagsID = %s")
+                updates.append("p.tagsID = %s")
                 values.append(tags_id)
 
-            if not updates:
-                logger.warning("No fields to update")
-                return False
+            query = f"""
+                UPDATE Posts p
+                INNER JOIN Tutor t ON p.tid = t.tid
+                SET {', '.join(updates)}
+                WHERE p.pid = %s AND t.uid = %s
+            """
+            cursor.execute(query, (*values, pid, uid))
+
+            if cursor.rowcount == 0:
+                outcome = self._post_owner_outcome(cursor, pid, uid)
+                conn.rollback()
+                return outcome
+
+            if old_tags_id is not None and old_tags_id != tags_id:
+                adjust_course_posts(cursor, old_tags_id, -1)
+                adjust_course_posts(cursor, tags_id, 1)
 
-            values.append(pid)
-            query = f"UPDATE Posts SET {', '.join(updates)} WHERE pid = %s"
-            
-            cursor.execute(query, tuple(values))
             conn.commit()
-            rowcount = cursor.rowcount
-            
-            return rowcount > 0
+            self.invalidate_feed()
+            return 'updated'
 
+        except mysql.connector.IntegrityError as e:
+            logger.error(f"Tag {tags_id} does not exist: {e}")
+            if conn:
+                conn.rollback()
+            return 'invalid_tag'
         except Exception as e:
-            logger.error(f"Update post error: {e}", exc_info=True)
+            logger.error(f"Update own post error: {e}", exc_info=True)
             if conn:
                 conn.rollback()
-            return False
-        
+            return None
+
         finally:
             if cursor:
                 cursor.close()
             if conn:
                 conn.close()
-        
-    def delete_post(self, pid: int) -> bool:
+
+    def delete_own_post(self, pid: int, uid: int) -> Optional[str]:
+        """
+        Delete a post only if user uid owns it, with the ownership check inside the
+        write itself. Returns 'deleted', 'not_found' or 'forbidden', or None on error.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            query = "DELETE FROM Posts WHERE pid = %s"
-            cursor.execute(query, (pid,))
+            cursor = conn.cursor(dictionary=True)
+
+            # Lock the post only if the caller owns it, so the delete and the count agree
+            cursor.execute("""
+                SELECT p.tagsID
+                FROM Posts p
+                INNER JOIN Tutor t ON p.tid = t.tid
+                WHERE p.pid = %s AND t.uid = %s
+                FOR UPDATE
+            """, (pid, uid))
+            post = cursor.fetchone()
+            if not post:
+                outcome = self._post_owner_outcome(cursor, pid, uid)
+                return 'not_found' if outcome == 'unchanged' else outcome
+
+            cursor.execute("DELETE FROM Posts WHERE pid = %s", (pid,))
+            adjust_course_posts(cursor, post['tagsID'], -1)
+
             conn.commit()
-            rowcount = cursor.rowcount
-            
-            return rowcount > 0
+            self.invalidate_feed()
+            return 'deleted'
 
         except Exception as e:
-            logger.error(f"Delete post error: {e}", exc_info=True)
+            logger.error(f"Delete own post error: {e}", exc_info=True)
             if conn:
                 conn.rollback()
-            return False
-        
+            return None
+
         finally:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
@@ -0,0 +1,137 @@
+from typing import Dict, List
+import threading
+import time
+import logging
+from db.Auth import ConnectionPool
+from db.TutorCache import TutorCache
+from db.Leaderboard import TutorLeaderboard
+
+logger = logging.getLogger(__name__)
+
+# Pending status changes are written to Tutor.status this often
+PRESENCE_FLUSH_SECONDS = 5
+
+# A connection with no ping for this long counts as away
+PRESENCE_TIMEOUT_SECONDS = 90
+
+
+class PresenceTracker:
+    """
+    Process-wide presence derived from the messaging WebSocket: connecting or
+    pinging marks a user available, disconnecting or going quiet marks them away.
+    State lives in memory; flush() coalesces the changes since the last flush into
+    one UPDATE per status, so heartbeats never touch MySQL.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self.pool = ConnectionPool()
+        self.cache = TutorCache()
+        self.leaderboard = TutorLeaderboard()
+        self._state_lock = threading.Lock()
+        self._last_seen: Dict[int, float] = {}
+        self._pending: Dict[int, str] = {}
+        self._persisted: Dict[int, str] = {}
+
+    def connected(self, uid: int):
+        with self._state_lock:
+            self._last_seen[uid] = time.monotonic()
+            self._set(uid, 'available')
+
+    def heartbeat(self, uid: int):
+        with self._state_lock:
+            if uid not in self._last_seen:
+                # Swept as away after a long gap, but the socket is still open and pinging
+                self._set(uid, 'available')
+            self._last_seen[uid] = time.monotonic()
+
+    def disconnected(self, uid: int):
+        with self._state_lock:
+            self._last_seen.pop(uid, None)
+            self._set(uid, 'away')
+
+    def _set(self, uid: int, status: str):
+        if self._persisted.get(uid) == status:
+            self._pending.pop(uid, None)
+        else:
+            self._pending[uid] = status
+
+    def sweep(self):
+        """Mark connections that stopped pinging as away"""
+        cutoff = time.monotonic() - PRESENCE_TIMEOUT_SECONDS
+        with self._state_lock:
+            for uid in [uid for uid, seen in self._last_seen.items() if seen < cutoff]:
+                del self._last_seen[uid]
+                self._set(uid, 'away')
+
+    def flush(self) -> int:
+        """Write pending status changes to Tutor.status; returns how many users were flushed"""
+        with self._state_lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        by_status: Dict[str, List[int]] = {}
+        for uid, status in pending.items():
+            by_status.setdefault(status, []).append(uid)
+
+        conn = None
+        cursor = None
+        try:
+            conn = self.pool.get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            for status, uids in by_status.items():
+                cursor.execute(
+                    f"UPDATE Tutor SET status = %s WHERE uid IN ({','.join(['%s'] * len(uids))})",
+                    (status, *uids)
+                )
+
+            cursor.execute(
+                f"SELECT tid, uid FROM Tutor WHERE uid IN ({','.join(['%s'] * len(pending))})",
+                tuple(pending)
+            )
+            tutors = cursor.fetchall()
+            conn.commit()
+
+            with self._state_lock:
+                for uid, status in pending.items():
+                    self._persisted[uid] = status
+                    # A newer change for a user that just went back to the persisted status is a no-op
+                    if self._pending.get(uid) == status:
+                        del self._pending[uid]
+                # Only connected users need their persisted status to skip no-op writes;
+                # everyone else is away in MySQL and a reconnect always writes
+                for uid in [uid for uid in self._persisted if uid not in self._last_seen]:
+                    del self._persisted[uid]
+
+            for tutor in tutors:
+                self.cache.update(tutor['tid'], status=pending[tutor['uid']])
+                self.leaderboard.update(tutor['tid'], status=pending[tutor['uid']])
+
+            return len(pending)
+
+        except Exception as e:
+            logger.error(f"Flush presence error: {e}", exc_info=True)
+            if conn:
+                conn.rollback()
+            # Put the batch back unless a newer change superseded it
+            with self._state_lock:
+                for uid, status in pending.items():
+                    self._pending.setdefault(uid, status)
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
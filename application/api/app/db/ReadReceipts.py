@@ -0,0 +1,119 @@
+from typing import Dict, Tuple
+import threading
+import logging
+from db.Auth import ConnectionPool
+from db.Messages import conversation_key
+
+logger = logging.getLogger(__name__)
+
+# Pending read acknowledgements are written to Conversations this often
+READ_FLUSH_SECONDS = 2
+
+
+class ReadReceipts:
+    """
+    Process-wide buffer of "read up to mid" acknowledgements. Clients ack as
+    messages scroll into view; acks for the same conversation coalesce to the
+    highest mid in memory and flush() applies them in one transaction, so a burst
+    of reads costs one row update per conversation instead of one per message.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self.pool = ConnectionPool()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int], int] = {}
+
+    def acknowledge(self, uid: int, other_uid: int, mid: int):
+        """Record that uid has read every message from other_uid up to and including mid"""
+        with self._pending_lock:
+            key = (uid, other_uid)
+            if mid > self._pending.get(key, 0):
+                self._pending[key] = mid
+
+    def flush(self) -> int:
+        """Apply pending acknowledgements; returns how many conversations were updated"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        conn = None
+        cursor = None
+        try:
+            conn = self.pool.get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            # Each plain read below sees messages committed up to the locked lastMID
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+
+            read_by_user: Dict[int, int] = {}
+            updated = 0
+            for (uid, other_uid), mid in sorted(pending.items()):
+                cursor.execute("""
+                    SELECT unreadCount, lastReadMID, lastMID
+                    FROM Conversations
+                    WHERE uid = %s AND otherUID = %s
+                    FOR UPDATE
+                """, (uid, other_uid))
+                conversation = cursor.fetchone()
+
+                if not conversation:
+                    continue
+
+                # Never acknowledge past the newest message actually in the conversation
+                ack = min(mid, conversation['lastMID'])
+                if ack <= conversation['lastReadMID']:
+                    continue
+
+                cursor.execute("""
+                    SELECT COUNT(*) AS newly_read
+                    FROM Messages
+                    WHERE convKey = %s AND senderUID = %s AND mid > %s AND mid <= %s
+                """, (conversation_key(uid, other_uid), other_uid, conversation['lastReadMID'], ack))
+                read = min(cursor.fetchone()['newly_read'], conversation['unreadCount'])
+
+                cursor.execute("""
+                    UPDATE Conversations
+                    SET unreadCount = unreadCount - %s, lastReadMID = %s
+                    WHERE uid = %s AND otherUID = %s
+                """, (read, ack, uid, other_uid))
+
+                read_by_user[uid] = read_by_user.get(uid, 0) + read
+                updated += 1
+
+            for uid, read in read_by_user.items():
+                if read:
+                    cursor.execute(
+                        "UPDATE UnreadCounts SET total = GREATEST(total - %s, 0) WHERE uid = %s",
+                        (read, uid)
+                    )
+
+            conn.commit()
+            return updated
+
+        except Exception as e:
+            logger.error(f"Flush read receipts error: {e}", exc_info=True)
+            if conn:
+                conn.rollback()
+            # Put the batch back unless a newer acknowledgement superseded it
+            with self._pending_lock:
+                for key, mid in pending.items():
+                    if mid > self._pending.get(key, 0):
+                        self._pending[key] = mid
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
@@ -2,6 +2,14 @@ DROP DATABASE IF EXISTS GatorGuides;
 CREATE DATABASE GatorGuides;
 USE GatorGuides;
 
+# Applied migrations (see db/migrations). A fresh schema already includes every version listed here.
+DROP TABLE IF EXISTS SchemaVersion;
+CREATE TABLE SchemaVersion
+(
+    version   INT PRIMARY KEY,
+    appliedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 # Registered User table and content
 DROP TABLE IF EXISTS User;
 CREATE TABLE User
@@ -32,10 +40,20 @@ CREATE TABLE Tutor
 (
     tid                INT PRIMARY KEY AUTO_INCREMENT,
     uid                INT NOT NULL,
-    rating             DOUBLE,
+    rating             DOUBLE NOT NULL                            DEFAULT 0,
+    ratingSum          DOUBLE NOT NULL                            DEFAULT 0,
+    ratingCount        INT    NOT NULL                            DEFAULT 0,
     status             ENUM ('available', 'away', 'busy')         DEFAULT 'available',
     verificationStatus ENUM ('unapproved', 'pending', 'approved') DEFAULT 'pending',
-    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE
+    # Listing order (approved, pending, unapproved) as a stored column so it can be indexed
+    listingRank        TINYINT AS (CASE verificationStatus
+                                       WHEN 'approved' THEN 0
+                                       WHEN 'pending' THEN 1
+                                       ELSE 2 END) STORED,
+    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE,
+    INDEX idx_tutor_verification_rating (verificationStatus, rating),
+    INDEX idx_tutor_verification_tid (verificationStatus, tid),
+    INDEX idx_tutor_listing (listingRank, rating DESC, tid)
 );
 
 # Removes the need to search a tutors tags via their posts, streamlining the searching process
@@ -47,7 +65,8 @@ CREATE TABLE TutorTags
     tagsID     INT NOT NULL,
     FOREIGN KEY (tid) REFERENCES Tutor (tid) ON DELETE CASCADE,
     FOREIGN KEY (tagsID) REFERENCES Tags (tagsID) ON DELETE CASCADE,
-    UNIQUE KEY (tid, tagsID)
+    UNIQUE KEY (tid, tagsID),
+    INDEX idx_tutortags_tag (tagsID, tid)
 );
 
 # Posts table contains posts made by tutors and relevant content
@@ -60,7 +79,10 @@ CREATE TABLE Posts
     content   TEXT,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (tid) REFERENCES Tutor (tid) ON DELETE CASCADE,
-    FOREIGN KEY (tagsID) REFERENCES Tags (tagsID) ON DELETE CASCADE
+    FOREIGN KEY (tagsID) REFERENCES Tags (tagsID) ON DELETE CASCADE,
+    INDEX idx_posts_feed (timestamp, pid),
+    INDEX idx_posts_tid_timestamp (tid, timestamp),
+    INDEX idx_posts_tag_timestamp (tagsID, timestamp)
 );
 
 # Sessions table holds all past, current, and future tutoring sessions scheduled
@@ -103,10 +125,42 @@ CREATE TABLE Messages
     mid         INT PRIMARY KEY AUTO_INCREMENT,
     senderUID   INT  NOT NULL,
     receiverUID INT  NOT NULL,
+    # Same for both directions of a conversation: (min uid, max uid) packed into one value
+    convKey     BIGINT AS (LEAST(senderUID, receiverUID) * 4294967296
+                           + GREATEST(senderUID, receiverUID)) STORED,
     content     TEXT NOT NULL,
     timestamp   DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (senderUID) REFERENCES User (uid) ON DELETE CASCADE,
-    FOREIGN KEY (receiverUID) REFERENCES User (uid) ON DELETE CASCADE
+    FOREIGN KEY (receiverUID) REFERENCES User (uid) ON DELETE CASCADE,
+    INDEX idx_messages_conversation (convKey, mid)
+);
+
+# One row per user per conversation partner, updated by send_message so the inbox never scans Messages
+DROP TABLE IF EXISTS Conversations;
+CREATE TABLE Conversations
+(
+    uid           INT          NOT NULL,
+    otherUID      INT          NOT NULL,
+    lastMID       INT          NOT NULL,
+    lastSenderUID INT          NOT NULL,
+    lastContent   VARCHAR(200) NOT NULL,
+    lastTimestamp DATETIME     NOT NULL,
+    unreadCount   INT          NOT NULL DEFAULT 0,
+    # Highest mid from otherUID that uid has acknowledged reading
+    lastReadMID   INT          NOT NULL DEFAULT 0,
+    PRIMARY KEY (uid, otherUID),
+    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE,
+    FOREIGN KEY (otherUID) REFERENCES User (uid) ON DELETE CASCADE,
+    INDEX idx_conversations_inbox (uid, lastMID)
+);
+
+# Sum of a user's Conversations.unreadCount, kept alongside it so the unread badge is one row read
+DROP TABLE IF EXISTS UnreadCounts;
+CREATE TABLE UnreadCounts
+(
+    uid   INT PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE
 );
 
 # Login Sessions table for authentication
@@ -133,4 +187,40 @@ CREATE TABLE TutorAvailability
     isActive       BOOLEAN DEFAULT TRUE,
     FOREIGN KEY (tid) REFERENCES Tutor (tid) ON DELETE CASCADE,
     UNIQUE KEY unique_availability (tid, day, startTime, endTime)
-);
\ No newline at end of file
+);
+
+# Precomputed browse counters per course, maintained by the API write paths (db/CourseStats.py)
+DROP TABLE IF EXISTS CourseStats;
+CREATE TABLE CourseStats
+(
+    tagsID     INT PRIMARY KEY,
+    tutorCount INT    NOT NULL DEFAULT 0,
+    postCount  INT    NOT NULL DEFAULT 0,
+    ratingSum  DOUBLE NOT NULL DEFAULT 0,
+    FOREIGN KEY (tagsID) REFERENCES Tags (tagsID) ON DELETE CASCADE
+);
+
+# Ratings per tutor by half-star bucket (bucket = FLOOR(rating * 2), 0-10), maintained by create_rating
+DROP TABLE IF EXISTS RatingHistogram;
+CREATE TABLE RatingHistogram
+(
+    tid         INT     NOT NULL,
+    bucket      TINYINT NOT NULL,
+    bucketCount INT     NOT NULL DEFAULT 0,
+    PRIMARY KEY (tid, bucket),
+    FOREIGN KEY (tid) REFERENCES Tutor (tid) ON DELETE CASCADE
+);
+
+INSERT INTO SchemaVersion (version) VALUES
+(1),
+(2),
+(3),
+(4),
+(5),
+(6),
+(7),
+(8),
+(9),
+(10),
+(11),
+(12);
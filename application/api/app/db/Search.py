@@ -1,195 +1,280 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from datetime import datetime
+import hashlib
+import json
 import logging
+import threading
+import time
 from db.Auth import ConnectionPool
+from core.ranking import rank_candidates
 
 logger = logging.getLogger(__name__)
 
+VALID_STATUSES = ['available', 'away', 'busy']
+VALID_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+RATING_FACET_THRESHOLDS = [1, 2, 3, 4, 4.5]
+
+# Newest matching posts included in each search document
+SEARCH_POSTS_PER_TUTOR = 10
+
+# Candidates per keyset batch when streaming search results
+STREAM_BATCH = 50
+
+# Tags are reloaded at most this often (seconds) to pick up changes made outside the API
+TAG_CACHE_TTL = 3600
+
 
 class GatorGuidesSearch:
     def __init__(self):
         self.pool = ConnectionPool()
+        self._tags_lock = threading.Lock()
+        self._tags: Optional[List[Dict[str, Any]]] = None
+        self._tags_etag: Optional[str] = None
+        self._tags_version = 0
+        self._tags_loaded_at = 0.0
     
     def _get_connection(self):
         return self.pool.get_connection()
 
-    def search(self, query: str) -> List[Dict[str, Any]]:
-        conn = None
-        cursor = None
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            results = []
-            
-            if not query or query.strip() == '':
-                all_tutors_query = """
-                    SELECT 
-                        p.pid, p.tid, p.content, p.timestamp,
-                        tutor.rating, tutor.status,
-                        u.firstName, u.lastName, u.email, u.bio,
-                        tg.tags as post_tag
-                    FROM Posts p
-                    INNER JOIN Tags tg ON p.tagsID = tg.tagsID
-                    INNER JOIN Tutor tutor ON p.tid = tutor.tid
-                    INNER JOIN User u ON tutor.uid = u.uid
-                    WHERE tutor.verificationStatus = 'approved'
-                    ORDER BY tutor.rating DESC, p.timestamp DESC
-                """
-                cursor.execute(all_tutors_query)
-                posts_by_tag = cursor.fetchall()
-            else:
-                normalized_query = query.replace(' ', '').lower()
-                
-                tag_search_query = """
-                    SELECT 
-                        p.pid, p.tid, p.content, p.timestamp,
-                        tutor.rating, tutor.status,
-                        u.firstName, u.lastName, u.email, u.bio,
-                        tg.tags as post_tag
+    def _filter_flags(
+            self,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None
+    ) -> Tuple[Dict[str, str], Dict[str, List[Any]]]:
+        """
+        Build one SQL predicate per facet against Tutor t. Unset filters become TRUE
+        so facet counts can drop their own predicate and keep the others.
+        """
+        if statuses and any(status not in VALID_STATUSES for status in statuses):
+            raise ValueError(f"Invalid status filter: {statuses}")
+        if day is not None and day not in VALID_DAYS:
+            raise ValueError(f"Invalid day filter: {day}")
+        if hour is not None and not (0 <= hour <= 23):
+            raise ValueError(f"Invalid hour filter: {hour}")
+
+        flags = {'rating': 'TRUE', 'status': 'TRUE', 'tags': 'TRUE', 'availability': 'TRUE'}
+        params: Dict[str, List[Any]] = {'rating': [], 'status': [], 'tags': [], 'availability': []}
+
+        if min_rating is not None:
+            flags['rating'] = 'COALESCE(t.rating, 0) >= %s'
+            params['rating'] = [min_rating]
+
+        if statuses:
+            flags['status'] = f"t.status IN ({','.join(['%s'] * len(statuses))})"
+            params['status'] = list(statuses)
+
+        if tag_ids:
+            flags['tags'] = f"""EXISTS (
+                SELECT 1 FROM TutorTags ftt
+                WHERE ftt.tid = t.tid AND ftt.tagsID IN ({','.join(['%s'] * len(tag_ids))})
+            )"""
+            params['tags'] = list(tag_ids)
+
+        if day is not None or hour is not None:
+            conditions = ['fta.tid = t.tid', 'fta.isActive = TRUE']
+            if day is not None:
+                conditions.append('fta.day = %s')
+                params['availability'].append(day)
+            if hour is not None:
+                conditions.append('fta.startTime <= %s AND fta.endTime > %s')
+                params['availability'].extend([hour, hour])
+            flags['availability'] = f"EXISTS (SELECT 1 FROM TutorAvailability fta WHERE {' AND '.join(conditions)})"
+
+        return flags, params
+
+    def _search_statement(
+            self,
+            query: str,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        Single statement producing one row per matching tutor with its newest
+        SEARCH_POSTS_PER_TUTOR matching posts, courses and profile_tags aggregated
+        as JSON arrays. Posts are read per tutor newest first straight off
+        idx_posts_tid_timestamp, so no step sorts Posts.
+        """
+        candidates_sql, candidate_params, tag_pattern = self._candidates_statement(
+            query, min_rating, statuses, tag_ids, day, hour
+        )
+
+        search_query = f"""
+            WITH {candidates_sql},
+            tag_docs AS (
+                SELECT
+                    tt.tid,
+                    ROW_NUMBER() OVER w AS rn,
+                    JSON_ARRAYAGG(tg.tags) OVER w AS profile_tags
+                FROM TutorTags tt
+                INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                INNER JOIN candidates c ON c.tid = tt.tid
+                WINDOW w AS (
+                    PARTITION BY tt.tid ORDER BY tg.tags
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                )
+            )
+            SELECT
+                c.tid, c.rating, c.status,
+                c.firstName, c.lastName, c.email, c.bio,
+                c.match_type, c.name_priority, c.rating_count,
+                pd.recent_post, pd.posts, pc.courses, td.profile_tags
+            FROM candidates c
+            LEFT JOIN LATERAL (
+                SELECT
+                    MAX(recent.timestamp) AS recent_post,
+                    JSON_ARRAYAGG(JSON_OBJECT(
+                        'pid', recent.pid,
+                        'course', recent.course,
+                        'content', recent.content,
+                        'timestamp', REPLACE(CAST(recent.timestamp AS CHAR), ' ', 'T')
+                    )) AS posts
+                FROM (
+                    SELECT p.pid, p.content, p.timestamp, tg.tags AS course
                     FROM Posts p
                     INNER JOIN Tags tg ON p.tagsID = tg.tagsID
-                    INNER JOIN Tutor tutor ON p.tid = tutor.tid
-                    INNER JOIN User u ON tutor.uid = u.uid
-                    WHERE REPLACE(LOWER(tg.tags), ' ', '') LIKE %s
-                    AND tutor.verificationStatus = 'approved'
-                    ORDER BY tutor.rating DESC, p.timestamp DESC
-                """
-                cursor.execute(tag_search_query, (f'%{normalized_query}%',))
-                posts_by_tag = cursor.fetchall()
-
-            unique_tids = set()
-            tag_tutor_data = {}
-
-            for post in posts_by_tag:
-                tid = post['tid']
-                unique_tids.add(tid)
-
-                if tid not in tag_tutor_data:
-                    tag_tutor_data[tid] = {
-                        'tid': tid,
-                        'name': f"{post['firstName']} {post['lastName']}",
-                        'email': post['email'],
-                        'rating': post['rating'],
-                        'status': post['status'],
-                        'profile_tags': [],
-                        'bio': post['bio'],
-                        'match_type': 'tag',
-                        'posts': [],
-                        'courses': set()
-                    }
-
-                tag_tutor_data[tid]['posts'].append({
-                    'pid': post['pid'],
-                    'course': post['post_tag'],
-                    'content': post['content'],
-                    'timestamp': post['timestamp'].isoformat() if hasattr(post['timestamp'], 'isoformat') else str(post['timestamp'])
-                })
-                tag_tutor_data[tid]['courses'].add(post['post_tag'])
-
-            if unique_tids:
-                placeholders = ','.join(['%s'] * len(unique_tids))
-                expertise_query = f"""
-                    SELECT tt.tid, tg.tags
-                    FROM TutorTags tt
-                    INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
-                    WHERE tt.tid IN ({placeholders})
-                    ORDER BY tt.tid, tg.tags
-                """
-                cursor.execute(expertise_query, tuple(unique_tids))
-                expertise_results = cursor.fetchall()
-
-                for row in expertise_results:
-                    tid = row['tid']
-                    if tid in tag_tutor_data:
-                        tag_tutor_data[tid]['profile_tags'].append(row['tags'])
-
-            for data in tag_tutor_data.values():
-                data['courses'] = list(data['courses'])
-                results.append(data)
+                    WHERE p.tid = c.tid
+                    AND (c.match_type = 'name' OR REPLACE(LOWER(tg.tags), ' ', '') LIKE %s)
+                    ORDER BY p.timestamp DESC, p.pid DESC
+                    LIMIT %s
+                ) recent
+            ) pd ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT JSON_ARRAYAGG(tg.tags) AS courses
+                FROM Tags tg
+                WHERE EXISTS (SELECT 1 FROM Posts p WHERE p.tid = c.tid AND p.tagsID = tg.tagsID)
+                AND (c.match_type = 'name' OR REPLACE(LOWER(tg.tags), ' ', '') LIKE %s)
+            ) pc ON TRUE
+            LEFT JOIN tag_docs td ON td.tid = c.tid AND td.rn = 1
+            ORDER BY
+                c.match_type = 'name',
+                CASE WHEN c.match_type = 'tag' THEN c.rating END DESC,
+                c.last_post DESC,
+                c.name_priority, c.firstName, c.lastName
+        """
+        return search_query, (*candidate_params, tag_pattern, SEARCH_POSTS_PER_TUTOR, tag_pattern)
+
+    def _candidates_statement(
+            self,
+            query: str,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None
+    ) -> Tuple[str, List[Any], str]:
+        """
+        The tag_hits and candidates CTEs shared by the search statements: approved
+        tutors matching the query by post tag or name, with the facet filters applied.
+        Returns the CTE text, its params and the normalized tag LIKE pattern.
+        """
+        flags, flag_params = self._filter_flags(min_rating, statuses, tag_ids, day, hour)
+        filter_sql = ' AND '.join(flags[name] for name in flags)
+        filter_params = [value for name in flags for value in flag_params[name]]
+
+        query = query.strip() if query else ''
+        tag_pattern = f"%{query.replace(' ', '').lower()}%"
+        name_pattern = f'%{query}%'
 
-            name_search_query = """
-                SELECT DISTINCT
+        candidates_sql = f"""tag_hits AS (
+                SELECT p.tid, MAX(p.timestamp) AS last_post
+                FROM Posts p
+                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                WHERE REPLACE(LOWER(tg.tags), ' ', '') LIKE %s
+                GROUP BY p.tid
+            ),
+            candidates AS (
+                SELECT
                     t.tid, t.rating, t.status,
                     u.firstName, u.lastName, u.email, u.bio,
-                    CASE 
+                    CASE WHEN th.tid IS NOT NULL THEN 'tag' ELSE 'name' END AS match_type,
+                    th.last_post,
+                    t.ratingCount AS rating_count,
+                    CASE
                         WHEN u.firstName LIKE %s THEN 1
                         WHEN u.lastName LIKE %s THEN 2
                         ELSE 3
-                    END as name_priority
+                    END AS name_priority
                 FROM Tutor t
                 INNER JOIN User u ON t.uid = u.uid
-                WHERE (u.firstName LIKE %s OR u.lastName LIKE %s)
-                AND t.verificationStatus = 'approved'
-                ORDER BY name_priority, u.firstName, u.lastName
-            """
+                LEFT JOIN tag_hits th ON th.tid = t.tid
+                WHERE t.verificationStatus = 'approved'
+                AND (th.tid IS NOT NULL OR u.firstName LIKE %s OR u.lastName LIKE %s)
+                AND {filter_sql}
+            )"""
+        params = [
+            tag_pattern,
+            name_pattern, name_pattern,
+            name_pattern, name_pattern,
+            *filter_params
+        ]
+        return candidates_sql, params, tag_pattern
 
-            cursor.execute(name_search_query, (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
-            tutors_by_name = cursor.fetchall()
-
-            name_tids = []
-            name_tutor_data = {}
-
-            for tutor in tutors_by_name:
-                tid = tutor['tid']
-                if tid not in tag_tutor_data:
-                    name_tids.append(tid)
-                    name_tutor_data[tid] = {
-                        'tid': tid,
-                        'name': f"{tutor['firstName']} {tutor['lastName']}",
-                        'email': tutor['email'],
-                        'rating': tutor['rating'],
-                        'status': tutor['status'],
-                        'profile_tags': [],
-                        'bio': tutor['bio'],
-                        'match_type': 'name',
-                        'posts': [],
-                        'courses': set()
-                    }
-
-            if name_tids:
-                placeholders = ','.join(['%s'] * len(name_tids))
-                posts_query = f"""
-                    SELECT p.pid, p.tid, p.content, p.timestamp, tg.tags
-                    FROM Posts p
-                    INNER JOIN Tags tg ON p.tagsID = tg.tagsID
-                    WHERE p.tid IN ({placeholders})
-                    ORDER BY p.tid, p.timestamp DESC
-                """
-                cursor.execute(posts_query, tuple(name_tids))
-                posts_results = cursor.fetchall()
-
-                for post in posts_results:
-                    tid = post['tid']
-                    if tid in name_tutor_data:
-                        name_tutor_data[tid]['posts'].append({
-                            'pid': post['pid'],
-                            'course': post['tags'],
-                            'content': post['content'],
-                            'timestamp': post['timestamp'].isoformat() if hasattr(post['timestamp'], 'isoformat') else str(post['timestamp'])
-                        })
-                        name_tutor_data[tid]['courses'].add(post['tags'])
-
-                expertise_query = f"""
-                    SELECT tt.tid, tg.tags
-                    FROM TutorTags tt
-                    INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
-                    WHERE tt.tid IN ({placeholders})
-                    ORDER BY tt.tid, tg.tags
-                """
-                cursor.execute(expertise_query, tuple(name_tids))
-                expertise_results = cursor.fetchall()
-
-                for row in expertise_results:
-                    tid = row['tid']
-                    if tid in name_tutor_data:
-                        name_tutor_data[tid]['profile_tags'].append(row['tags'])
-
-            for data in name_tutor_data.values():
-                data['courses'] = list(data['courses'])
+    def _search_document(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        # JSON_ARRAYAGG does not promise input order; restore newest first
+        posts = sorted(self._load_json(row['posts']), key=lambda post: (post['timestamp'], post['pid']), reverse=True)
+        return {
+            'tid': row['tid'],
+            'name': f"{row['firstName']} {row['lastName']}",
+            'email': row['email'],
+            'rating': row['rating'],
+            'status': row['status'],
+            'profile_tags': self._load_json(row['profile_tags']),
+            'bio': row['bio'],
+            'match_type': row['match_type'],
+            'posts': posts,
+            'courses': self._load_json(row['courses'])
+        }
+
+    def search(
+            self,
+            query: str,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None,
+            ranked: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the per-tutor search documents (posts, courses, profile_tags) in a
+        single statement. Facet filters are applied in SQL. Results are ordered by
+        relevance score (core.ranking); with ranked=False tag hits come first
+        ordered by rating and latest matching post, followed by name-only hits.
+        """
+        conn = None
+        cursor = None
+        try:
+            search_query, params = self._search_statement(query, min_rating, statuses, tag_ids, day, hour)
+
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(search_query, params)
+            rows = cursor.fetchall()
+
+            results = []
+            for row in rows:
+                data = self._search_document(row)
+                data['name_priority'] = row['name_priority']
+                data['rating_count'] = row['rating_count']
+                data['last_post'] = row['recent_post']
                 results.append(data)
 
+            if ranked:
+                results = rank_candidates(results)
+
+            for data in results:
+                del data['name_priority'], data['rating_count'], data['last_post']
+
             return results
 
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Search error for query '{query}': {e}", exc_info=True)
             return []
@@ -199,7 +284,268 @@ class GatorGuidesSearch:
             if conn:
                 conn.close()
 
+    def iter_search(
+            self,
+            query: str,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream search documents in tid order, STREAM_BATCH candidates at a time.
+        Each batch is a keyset query (tid > last tid) plus its posts and profile
+        tags on one pooled connection, released before the batch is yielded, so a
+        slow client never holds a connection. Filters are validated up front.
+        """
+        candidates_sql, params, tag_pattern = self._candidates_statement(
+            query, min_rating, statuses, tag_ids, day, hour
+        )
+        batch_query = f"""
+            WITH {candidates_sql}
+            SELECT
+                c.tid, c.rating, c.status,
+                c.firstName, c.lastName, c.email, c.bio,
+                c.match_type
+            FROM candidates c
+            WHERE c.tid > %s
+            ORDER BY c.tid
+            LIMIT %s
+        """
+        return self._stream_batches(batch_query, tuple(params), tag_pattern)
+
+    def _stream_batches(self, batch_query: str, params: Tuple[Any, ...], tag_pattern: str) -> Iterator[Dict[str, Any]]:
+        after = 0
+        while True:
+            conn = None
+            cursor = None
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(batch_query, (*params, after, STREAM_BATCH))
+                rows = cursor.fetchall()
+                documents = self._stream_documents(conn, rows, tag_pattern) if rows else []
+
+            except Exception as e:
+                logger.error(f"Stream search error: {e}", exc_info=True)
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+                if conn:
+                    conn.close()
+
+            yield from documents
+
+            if len(rows) < STREAM_BATCH:
+                return
+            after = rows[-1]['tid']
+
+    def _stream_documents(self, conn, rows: List[Dict[str, Any]], tag_pattern: str) -> List[Dict[str, Any]]:
+        """Search documents for a batch of candidate rows, in the same shape as _search_document"""
+        tids = [row['tid'] for row in rows]
+        placeholders = ','.join(['%s'] * len(tids))
+        posts: Dict[int, List[Dict[str, Any]]] = {tid: [] for tid in tids}
+        profile_tags: Dict[int, List[str]] = {tid: [] for tid in tids}
+        name_matches = {row['tid'] for row in rows if row['match_type'] == 'name'}
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(f"""
+                SELECT
+                    p.pid, p.tid, p.content, p.timestamp, tg.tags,
+                    REPLACE(LOWER(tg.tags), ' ', '') LIKE %s AS tag_match
+                FROM Posts p
+                INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                WHERE p.tid IN ({placeholders})
+                ORDER BY p.tid, p.timestamp DESC, p.pid DESC
+            """, (tag_pattern, *tids))
+            for post in cursor.fetchall():
+                if post['tid'] in name_matches or post['tag_match']:
+                    posts[post['tid']].append({
+                        'pid': post['pid'],
+                        'course': post['tags'],
+                        'content': post['content'],
+                        'timestamp': post['timestamp'].isoformat() if isinstance(post['timestamp'], datetime) else str(post['timestamp'])
+                    })
+
+            cursor.execute(f"""
+                SELECT tt.tid, tg.tags
+                FROM TutorTags tt
+                INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                WHERE tt.tid IN ({placeholders})
+                ORDER BY tt.tid, tg.tags
+            """, tuple(tids))
+            for tag in cursor.fetchall():
+                profile_tags[tag['tid']].append(tag['tags'])
+        finally:
+            cursor.close()
+
+        return [
+            {
+                'tid': row['tid'],
+                'name': f"{row['firstName']} {row['lastName']}",
+                'email': row['email'],
+                'rating': row['rating'],
+                'status': row['status'],
+                'profile_tags': profile_tags[row['tid']],
+                'bio': row['bio'],
+                'match_type': row['match_type'],
+                'posts': posts[row['tid']][:SEARCH_POSTS_PER_TUTOR],
+                'courses': list(dict.fromkeys(post['course'] for post in posts[row['tid']]))
+            }
+            for row in rows
+        ]
+
+    def search_facets(
+            self,
+            query: str,
+            min_rating: Optional[float] = None,
+            statuses: Optional[List[str]] = None,
+            tag_ids: Optional[List[int]] = None,
+            day: Optional[str] = None,
+            hour: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Count matching tutors per facet value in one statement. Each facet is
+        counted with every filter applied except its own.
+        """
+        conn = None
+        cursor = None
+        try:
+            flags, flag_params = self._filter_flags(min_rating, statuses, tag_ids, day, hour)
+
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            query = query.strip() if query else ''
+            tag_pattern = f"%{query.replace(' ', '').lower()}%"
+            name_pattern = f'%{query}%'
+            thresholds = ' UNION ALL '.join(['SELECT %s AS threshold'] * len(RATING_FACET_THRESHOLDS))
+
+            facets_query = f"""
+                WITH tag_hits AS (
+                    SELECT DISTINCT p.tid
+                    FROM Posts p
+                    INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                    WHERE REPLACE(LOWER(tg.tags), ' ', '') LIKE %s
+                ),
+                base AS (
+                    SELECT
+                        t.tid, COALESCE(t.rating, 0) AS rating, t.status,
+                        ({flags['rating']}) AS f_rating,
+                        ({flags['status']}) AS f_status,
+                        ({flags['tags']}) AS f_tags,
+                        ({flags['availability']}) AS f_avail
+                    FROM Tutor t
+                    INNER JOIN User u ON t.uid = u.uid
+                    LEFT JOIN tag_hits th ON th.tid = t.tid
+                    WHERE t.verificationStatus = 'approved'
+                    AND (th.tid IS NOT NULL OR u.firstName LIKE %s OR u.lastName LIKE %s)
+                )
+                SELECT 'status' AS facet, b.status AS value, NULL AS label, COUNT(*) AS count
+                FROM base b
+                WHERE b.f_rating AND b.f_tags AND b.f_avail
+                GROUP BY b.status
+                UNION ALL
+                SELECT 'tag', CAST(tg.tagsID AS CHAR), tg.tags, COUNT(*)
+                FROM base b
+                INNER JOIN TutorTags tt ON tt.tid = b.tid
+                INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                WHERE b.f_rating AND b.f_status AND b.f_avail
+                GROUP BY tg.tagsID, tg.tags
+                UNION ALL
+                SELECT 'min_rating', CAST(r.threshold AS CHAR), NULL, COUNT(b.tid)
+                FROM ({thresholds}) r
+                LEFT JOIN base b ON b.rating >= r.threshold AND b.f_status AND b.f_tags AND b.f_avail
+                GROUP BY r.threshold
+                UNION ALL
+                SELECT 'total', NULL, NULL, COUNT(*)
+                FROM base b
+                WHERE b.f_rating AND b.f_status AND b.f_tags AND b.f_avail
+            """
+            cursor.execute(facets_query, (
+                tag_pattern,
+                *flag_params['rating'],
+                *flag_params['status'],
+                *flag_params['tags'],
+                *flag_params['availability'],
+                name_pattern, name_pattern,
+                *RATING_FACET_THRESHOLDS
+            ))
+            rows = cursor.fetchall()
+
+            facets = {
+                'status': {status: 0 for status in VALID_STATUSES},
+                'tags': [],
+                'minRating': {},
+                'total': 0
+            }
+            for row in rows:
+                if row['facet'] == 'status':
+                    facets['status'][row['value']] = row['count']
+                elif row['facet'] == 'tag':
+                    facets['tags'].append({'id': int(row['value']), 'name': row['label'], 'count': row['count']})
+                elif row['facet'] == 'min_rating':
+                    facets['minRating'][row['value']] = row['count']
+                else:
+                    facets['total'] = row['count']
+
+            facets['tags'].sort(key=lambda tag: (-tag['count'], tag['name']))
+            return facets
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Search facets error for query '{query}': {e}", exc_info=True)
+            return {'status': {}, 'tags': [], 'minRating': {}, 'total': 0}
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def _load_json(value) -> List[Any]:
+        if value is None:
+            return []
+        if isinstance(value, (list, dict)):
+            return value
+        return json.loads(value)
+
+    def get_tag_catalog(self) -> Dict[str, Any]:
+        """
+        Return the in-memory tag catalog with its version and strong ETag,
+        reloading from the database only when invalidated or older than TAG_CACHE_TTL.
+        The ETag is a content hash so every worker agrees on it.
+        """
+        with self._tags_lock:
+            if self._tags is None or time.monotonic() - self._tags_loaded_at > TAG_CACHE_TTL:
+                tags = self._load_tags()
+                if tags is not None:
+                    body = json.dumps(tags, separators=(',', ':')).encode()
+                    etag = f'"tags-{hashlib.sha256(body).hexdigest()[:32]}"'
+                    if etag != self._tags_etag:
+                        self._tags_version += 1
+                        self._tags_etag = etag
+                    self._tags = tags
+                    self._tags_loaded_at = time.monotonic()
+
+            return {
+                'version': self._tags_version,
+                'etag': self._tags_etag,
+                'tags': self._tags if self._tags is not None else []
+            }
+
+    def invalidate_tags(self):
+        with self._tags_lock:
+            self._tags_loaded_at = 0.0
+
     def get_all_tags(self) -> List[Dict[str, Any]]:
+        return list(self.get_tag_catalog()['tags'])
+
+    def _load_tags(self) -> Optional[List[Dict[str, Any]]]:
         conn = None
         cursor = None
         try:
@@ -214,9 +560,77 @@ class GatorGuidesSearch:
             
         except Exception as e:
             logger.error(f"Get tags error: {e}", exc_info=True)
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+    def get_course_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-course browse counters read straight from CourseStats, which is kept
+        current by the tutor, tag and post write paths (db/CourseStats.py).
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            query = """
+                SELECT tg.tagsID, tg.tags, cs.tutorCount, cs.postCount, cs.ratingSum
+                FROM Tags tg
+                INNER JOIN CourseStats cs ON cs.tagsID = tg.tagsID
+                ORDER BY tg.tags
+            """
+            cursor.execute(query)
+            rows = cursor.fetchall()
+
+            return [{
+                'id': row['tagsID'],
+                'name': row['tags'],
+                'tutorCount': row['tutorCount'],
+                'postCount': row['postCount'],
+                'avgRating': round(row['ratingSum'] / row['tutorCount'], 2) if row['tutorCount'] > 0 else 0.0
+            } for row in rows]
+
+        except Exception as e:
+            logger.error(f"Get course stats error: {e}", exc_info=True)
             return []
         finally:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def create_tag(self, name: str) -> Optional[Dict[str, Any]]:
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            cursor.execute("SELECT tagsID FROM Tags WHERE tags = %s", (name,))
+            if cursor.fetchone():
+                logger.error(f"Tag {name} already exists")
+                return None
+
+            cursor.execute("INSERT INTO Tags (tags) VALUES (%s)", (name,))
+            tag_id = cursor.lastrowid
+            cursor.execute("INSERT INTO CourseStats (tagsID) VALUES (%s)", (tag_id,))
+            conn.commit()
+
+            self.invalidate_tags()
+            return {'id': tag_id, 'name': name}
+
+        except Exception as e:
+            logger.error(f"Create tag error: {e}", exc_info=True)
+            if conn:
+                conn.rollback()
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
@@ -0,0 +1,117 @@
+from typing import Optional, Dict, Any
+import threading
+import time
+import copy
+
+# Entries are refreshed from MySQL at least this often in case a write bypassed the cache
+TUTOR_CACHE_TTL = 600
+
+
+class TutorCache:
+    """
+    Process-wide write-through cache of tutor records (the get_tutor document)
+    indexed by both tid and uid. Write paths call put/update/invalidate after
+    they commit; readers get deep copies so callers can't mutate cached entries.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self._entries_lock = threading.Lock()
+        self._by_tid: Dict[int, Dict[str, Any]] = {}
+        self._uid_to_tid: Dict[int, int] = {}
+        self._loaded_at: Dict[int, float] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def generation(self) -> int:
+        """Token a reader takes before loading from MySQL and passes back to put"""
+        with self._entries_lock:
+            return self._generation
+
+    def get(self, tid: int) -> Optional[Dict[str, Any]]:
+        with self._entries_lock:
+            return self._lookup(tid)
+
+    def get_by_uid(self, uid: int) -> Optional[Dict[str, Any]]:
+        with self._entries_lock:
+            tid = self._uid_to_tid.get(uid)
+            if tid is None:
+                self._misses += 1
+                return None
+            return self._lookup(tid)
+
+    def _lookup(self, tid: int) -> Optional[Dict[str, Any]]:
+        tutor = self._by_tid.get(tid)
+        if tutor is None or time.monotonic() - self._loaded_at[tid] > TUTOR_CACHE_TTL:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return copy.deepcopy(tutor)
+
+    def put(self, tutor: Dict[str, Any], generation: Optional[int] = None):
+        """
+        Store a full tutor record. A reader passes the generation it saw before
+        querying; if a write landed in between, its possibly stale copy is dropped.
+        """
+        with self._entries_lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._by_tid[tutor['tid']] = copy.deepcopy(tutor)
+            self._uid_to_tid[tutor['uid']] = tutor['tid']
+            self._loaded_at[tutor['tid']] = time.monotonic()
+
+    def update(self, tid: int, **fields):
+        """Patch fields of a cached tutor in place after a committed write"""
+        with self._entries_lock:
+            self._generation += 1
+            tutor = self._by_tid.get(tid)
+            if tutor is not None:
+                tutor.update(copy.deepcopy(fields))
+
+    def invalidate(self, tid: int):
+        with self._entries_lock:
+            self._generation += 1
+            self._drop(tid)
+
+    def invalidate_uid(self, uid: int):
+        with self._entries_lock:
+            self._generation += 1
+            tid = self._uid_to_tid.get(uid)
+            if tid is not None:
+                self._drop(tid)
+
+    def _drop(self, tid: int):
+        tutor = self._by_tid.pop(tid, None)
+        self._loaded_at.pop(tid, None)
+        if tutor is not None:
+            self._uid_to_tid.pop(tutor['uid'], None)
+            self._evictions += 1
+
+    def clear(self):
+        with self._entries_lock:
+            self._generation += 1
+            self._by_tid.clear()
+            self._uid_to_tid.clear()
+            self._loaded_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._entries_lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._by_tid),
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hitRate': round(self._hits / lookups, 4) if lookups else 0.0
+            }
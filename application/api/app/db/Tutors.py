@@ -1,42 +1,110 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+import base64
+import json
 import logging
+from datetime import datetime
 from db.Auth import ConnectionPool
+from db.CourseStats import adjust_tutor_courses, adjust_courses_for_tutors
+from db.TutorCache import TutorCache
+from db.Leaderboard import TutorLeaderboard
+from db.Posts import GatorGuidesPosts
+from core.similarity import TagSimilarityIndex
 import mysql.connector
 
 logger = logging.getLogger(__name__)
 
+# Half-star histogram buckets: bucket b holds ratings in [b / 2, (b + 1) / 2), with 5.0 in the last
+RATING_BUCKETS = 11
+
+
+def rating_bucket(rating: float) -> int:
+    return min(int(rating * 2), RATING_BUCKETS - 1)
+
+
+def rating_histogram(counts: Dict[int, int]) -> List[Dict[str, Any]]:
+    return [{'rating': bucket / 2, 'count': counts.get(bucket, 0)} for bucket in range(RATING_BUCKETS)]
+
+
+# Rows per multi-row INSERT when assigning tags in bulk
+TAG_INSERT_BATCH = 500
+
+WEEK_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Tutors per keyset page when streaming the full listing
+LISTING_STREAM_BATCH = 100
+
+# Projectable fields of the tutor listing, in response order, and the columns each one needs
+LISTING_FIELDS = ('tid', 'name', 'email', 'bio', 'rating', 'status', 'verificationStatus', 'tags')
+LISTING_COLUMNS = {
+    'name': ('u.firstName', 'u.lastName'),
+    'email': ('u.email',),
+    'bio': ('u.bio',),
+    'status': ('t.status',),
+    'verificationStatus': ('t.verificationStatus',)
+}
+
 
 class GatorGuidesTutors:
     def __init__(self):
         self.pool = ConnectionPool()
+        self.cache = TutorCache()
+        self.leaderboard = TutorLeaderboard()
+        self.similarity = TagSimilarityIndex()
     
     def _get_connection(self):
         return self.pool.get_connection()
 
     def update_tutor_rating(self, tid: int) -> bool:
+        """
+        Recompute the stored rating aggregates from Ratings. create_rating keeps
+        them current incrementally; this is only needed to repair drift.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
+
+            cursor.execute(
+                "SELECT COALESCE(rating, 0) AS rating, verificationStatus FROM Tutor WHERE tid = %s FOR UPDATE",
+                (tid,)
+            )
+            tutor = cursor.fetchone()
             
             avg_query = """
-                        SELECT AVG(rating) AS avg_rating, COUNT(*) AS rating_count
+                        SELECT COALESCE(SUM(rating), 0) AS rating_sum, COUNT(*) AS rating_count
                         FROM Ratings
                         WHERE tid = %s
                         """
             cursor.execute(avg_query, (tid,))
             result = cursor.fetchone()
 
-            if result and result['rating_count'] > 0:
-                avg_rating = round(result['avg_rating'], 2)
-                update_query = "UPDATE Tutor SET rating = %s WHERE tid = %s"
-                cursor.execute(update_query, (avg_rating, tid))
-            else:
-                update_query = "UPDATE Tutor SET rating = 0.0 WHERE tid = %s"
-                cursor.execute(update_query, (tid,))
+            rating_sum = float(result['rating_sum']) if result else 0.0
+            rating_count = result['rating_count'] if result else 0
+            avg_rating = round(rating_sum / rating_count, 2) if rating_count > 0 else 0.0
+
+            update_query = """
+                           UPDATE Tutor
+                           SET rating = %s, ratingSum = %s, ratingCount = %s
+                           WHERE tid = %s
+                           """
+            cursor.execute(update_query, (avg_rating, rating_sum, rating_count, tid))
+
+            cursor.execute("DELETE FROM RatingHistogram WHERE tid = %s", (tid,))
+            cursor.execute("""
+                INSERT INTO RatingHistogram (tid, bucket, bucketCount)
+                SELECT tid, FLOOR(rating * 2), COUNT(*)
+                FROM Ratings
+                WHERE tid = %s
+                GROUP BY tid, FLOOR(rating * 2)
+            """, (tid,))
+
+            if tutor and tutor['verificationStatus'] == 'approved':
+                adjust_tutor_courses(cursor, tid, 0, avg_rating - tutor['rating'])
             
             conn.commit()
+            self.cache.update(tid, rating=avg_rating)
+            self.leaderboard.update(tid, rating=avg_rating)
             return True
 
         except Exception as e:
@@ -63,7 +131,7 @@ class GatorGuidesTutors:
             cursor = conn.cursor(dictionary=True)
             
             user_check = """
-                         SELECT uid, firstName, lastName, email
+                         SELECT uid, firstName, lastName, email, bio, profilePicture
                          FROM User
                          WHERE uid = %s
                          """
@@ -87,6 +155,28 @@ class GatorGuidesTutors:
             cursor.execute(query, (uid, rating, status))
             conn.commit()
             tutor_id = cursor.lastrowid
+            self.cache.put({
+                'tid': tutor_id,
+                'uid': uid,
+                'name': f"{user['firstName']} {user['lastName']}",
+                'email': user['email'],
+                'bio': user['bio'],
+                'profilePicture': user['profilePicture'],
+                'rating': rating,
+                'status': status,
+                'verificationStatus': 'pending',
+                'expertise': []
+            })
+            self.leaderboard.add({
+                'tid': tutor_id,
+                'name': f"{user['firstName']} {user['lastName']}",
+                'email': user['email'],
+                'bio': user['bio'],
+                'rating': float(rating),
+                'status': status,
+                'verificationStatus': 'pending',
+                'tags': []
+            })
 
             return {
                 'tid': tutor_id,
@@ -119,12 +209,30 @@ class GatorGuidesTutors:
                 return False
 
             conn = self._get_connection()
-            cursor = conn.cursor()
+            cursor = conn.cursor(dictionary=True)
+
+            cursor.execute(
+                "SELECT COALESCE(rating, 0) AS rating, verificationStatus FROM Tutor WHERE tid = %s FOR UPDATE",
+                (tid,)
+            )
+            tutor = cursor.fetchone()
+            if not tutor:
+                return False
             
             query = "UPDATE Tutor SET verificationStatus = %s WHERE tid = %s"
             cursor.execute(query, (status, tid))
-            conn.commit()
             rowcount = cursor.rowcount
+
+            was_approved = tutor['verificationStatus'] == 'approved'
+            if was_approved != (status == 'approved'):
+                delta = -1 if was_approved else 1
+                adjust_tutor_courses(cursor, tid, delta, delta * tutor['rating'])
+
+            conn.commit()
+            self.cache.update(tid, verificationStatus=status)
+            self.leaderboard.update(tid, verificationStatus=status)
+            # The feed only lists posts from approved tutors
+            GatorGuidesPosts.invalidate_feed()
             
             return rowcount > 0
 
@@ -139,30 +247,96 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
+    def _lock_tutor_tags(self, cursor, tid: int) -> Optional[Dict[str, Any]]:
+        """Lock the tutor row and its TutorTags rows; returns rating, approval and current tag ids"""
+        cursor.execute("""
+            SELECT t.rating, t.verificationStatus, tt.tagsID
+            FROM Tutor t
+                     LEFT JOIN TutorTags tt ON tt.tid = t.tid
+            WHERE t.tid = %s
+            FOR UPDATE
+        """, (tid,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+
+        return {
+            'rating': rows[0]['rating'],
+            'approved': rows[0]['verificationStatus'] == 'approved',
+            'tags': {row['tagsID'] for row in rows if row['tagsID'] is not None}
+        }
+
+    def _apply_tag_diff(self, cursor, tid: int, tutor: Dict[str, Any], to_add: List[int], to_remove: List[int]) -> List[int]:
+        """
+        Apply tag inserts/deletes for a locked tutor, keeping CourseStats in step.
+        Raises ValueError before writing anything if any tag id in to_add does not
+        exist; returns the ids added.
+        """
+        if to_add:
+            cursor.execute(
+                f"SELECT tagsID FROM Tags WHERE tagsID IN ({','.join(['%s'] * len(to_add))})",
+                tuple(to_add)
+            )
+            valid = {row['tagsID'] for row in cursor.fetchall()}
+            unknown = [tag_id for tag_id in to_add if tag_id not in valid]
+            if unknown:
+                raise ValueError(f"Unknown tag ids: {', '.join(map(str, unknown))}")
+
+        if to_remove:
+            if tutor['approved']:
+                adjust_tutor_courses(cursor, tid, -1, -tutor['rating'], to_remove)
+            cursor.execute(
+                f"DELETE FROM TutorTags WHERE tid = %s AND tagsID IN ({','.join(['%s'] * len(to_remove))})",
+                (tid, *to_remove)
+            )
+
+        for i in range(0, len(to_add), TAG_INSERT_BATCH):
+            batch = to_add[i:i + TAG_INSERT_BATCH]
+            cursor.execute(
+                f"INSERT IGNORE INTO TutorTags (tid, tagsID) VALUES {','.join(['(%s, %s)'] * len(batch))}",
+                tuple(value for tag_id in batch for value in (tid, tag_id))
+            )
+
+        if to_add and tutor['approved']:
+            adjust_tutor_courses(cursor, tid, 1, tutor['rating'], to_add)
+
+        return to_add
+
+    def _refresh_tutor_tags(self, tid: int):
+        self.cache.invalidate(tid)
+        tutor = self._cache_tutor(tid)
+        if tutor:
+            self.leaderboard.update(tid, tags=tutor['expertise'])
+            self.similarity.update_tutor(tid, [tag['id'] for tag in tutor['expertise']])
+
     def add_tutor_tags(self, tid: int, tag_ids: List[int]) -> bool:
+        """
+        Add tags to a tutor's expertise in bulk; tags already assigned are skipped.
+        Raises ValueError, adding nothing, if any tag id does not exist.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            check_query = "SELECT tid FROM Tutor WHERE tid = %s"
-            cursor.execute(check_query, (tid,))
-            if not cursor.fetchone():
+            cursor = conn.cursor(dictionary=True)
+
+            tutor = self._lock_tutor_tags(cursor, tid)
+            if not tutor:
                 logger.error(f"Tutor {tid} does not exist")
                 return False
 
-            for tag_id in tag_ids:
-                try:
-                    query = "INSERT INTO TutorTags (tid, tagsID) VALUES (%s, %s)"
-                    cursor.execute(query, (tid, tag_id))
-                except mysql.connector.IntegrityError:
-                    # Tag already exists for this tutor, skip
-                    continue
+            to_add = [tag_id for tag_id in dict.fromkeys(tag_ids) if tag_id not in tutor['tags']]
+            inserted = self._apply_tag_diff(cursor, tid, tutor, to_add, [])
 
             conn.commit()
+            if inserted:
+                self._refresh_tutor_tags(tid)
             return True
 
+        except ValueError:
+            if conn:
+                conn.rollback()
+            raise
         except Exception as e:
             logger.error(f"Add tutor tags error: {e}", exc_info=True)
             if conn:
@@ -174,22 +348,170 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
+    def set_tutor_tags(self, tid: int, tag_ids: List[int]) -> Optional[Dict[str, Any]]:
+        """
+        Replace a tutor's expertise with tag_ids, writing only the difference
+        against the current TutorTags in one transaction. Raises ValueError,
+        changing nothing, if any tag id does not exist.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            tutor = self._lock_tutor_tags(cursor, tid)
+            if not tutor:
+                logger.error(f"Tutor {tid} does not exist")
+                return None
+
+            wanted = list(dict.fromkeys(tag_ids))
+            to_add = [tag_id for tag_id in wanted if tag_id not in tutor['tags']]
+            to_remove = sorted(tutor['tags'].difference(wanted))
+            added = self._apply_tag_diff(cursor, tid, tutor, to_add, to_remove)
+
+            conn.commit()
+            if added or to_remove:
+                self._refresh_tutor_tags(tid)
+
+            return {
+                'tid': tid,
+                'added': added,
+                'removed': to_remove
+            }
+
+        except ValueError:
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            logger.error(f"Set tutor tags error: {e}", exc_info=True)
+            if conn:
+                conn.rollback()
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
     def get_tutor(self, tid: int) -> Optional[Dict[str, Any]]:
+        tutor = self.cache.get(tid)
+        if tutor is None:
+            tutor = self._cache_tutor(tid)
+        return tutor
+
+    def get_tutor_by_uid(self, uid: int) -> Optional[Dict[str, Any]]:
+        tutor = self.cache.get_by_uid(uid)
+        if tutor is None:
+            tutor = self._cache_tutor(uid, by_uid=True)
+
+        if tutor:
+            return {
+                'tid': tutor['tid'],
+                'uid': tutor['uid'],
+                'name': tutor['name'],
+                'email': tutor['email'],
+                'rating': tutor['rating'],
+                'status': tutor['status'],
+                'verificationStatus': tutor['verificationStatus']
+            }
+
+        return None
+
+    def get_tutors(self, tids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        get_tutor records for many tids keyed by tid. Cache hits are served from memory;
+        the misses are loaded together in two queries and cached.
+        """
+        found: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for tid in dict.fromkeys(tids):
+            tutor = self.cache.get(tid)
+            if tutor is None:
+                missing.append(tid)
+            else:
+                found[tid] = tutor
+
+        if not missing:
+            return found
+
+        generation = self.cache.generation()
+        placeholders = ','.join(['%s'] * len(missing))
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            query = f"""
+                    SELECT
+                        t.tid, t.uid, t.rating, t.status, t.verificationStatus,
+                        u.firstName, u.lastName, u.email, u.bio, u.profilePicture
+                    FROM Tutor t
+                             INNER JOIN User u ON t.uid = u.uid
+                    WHERE t.tid IN ({placeholders})
+                    """
+            cursor.execute(query, tuple(missing))
+            tutors = cursor.fetchall()
+
+            if tutors:
+                tags_by_tutor = self._tags_by_tutor(cursor, [t['tid'] for t in tutors])
+
+            for tutor in tutors:
+                record = {
+                    'tid': tutor['tid'],
+                    'uid': tutor['uid'],
+                    'name': f"{tutor['firstName']} {tutor['lastName']}",
+                    'email': tutor['email'],
+                    'bio': tutor['bio'],
+                    'profilePicture': tutor['profilePicture'],
+                    'rating': tutor['rating'],
+                    'status': tutor['status'],
+                    'verificationStatus': tutor['verificationStatus'],
+                    'expertise': tags_by_tutor.get(tutor['tid'], [])
+                }
+                self.cache.put(record, generation)
+                found[record['tid']] = record
+
+            return found
+
+        except Exception as e:
+            logger.error(f"Get tutors error: {e}", exc_info=True)
+            return found
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def _cache_tutor(self, key: int, by_uid: bool = False) -> Optional[Dict[str, Any]]:
+        """Load a tutor record from MySQL and store it in the cache unless a write raced the load"""
+        generation = self.cache.generation()
+        tutor = self._load_tutor(key, by_uid)
+        if tutor:
+            self.cache.put(tutor, generation)
+        return tutor
+
+    def _load_tutor(self, key: int, by_uid: bool = False) -> Optional[Dict[str, Any]]:
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
-            query = """
+            query = f"""
                     SELECT
                         t.tid, t.uid, t.rating, t.status, t.verificationStatus,
                         u.firstName, u.lastName, u.email, u.bio, u.profilePicture
                     FROM Tutor t
                              INNER JOIN User u ON t.uid = u.uid
-                    WHERE t.tid = %s
+                    WHERE {'t.uid' if by_uid else 't.tid'} = %s
                     """
-            cursor.execute(query, (tid,))
+            cursor.execute(query, (key,))
             tutor = cursor.fetchone()
 
             if not tutor:
@@ -202,7 +524,7 @@ class GatorGuidesTutors:
                          WHERE tt.tid = %s
                          ORDER BY tg.tags
                          """
-            cursor.execute(tags_query, (tid,))
+            cursor.execute(tags_query, (tutor['tid'],))
             tags = cursor.fetchall()
 
             return {
@@ -230,39 +552,99 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
-    def get_tutor_by_uid(self, uid: int) -> Optional[Dict[str, Any]]:
+    def get_tutor_profile(self, tid: int, post_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        Everything the tutor profile page shows (profile, expertise, recent posts,
+        weekly availability and rating stats with histogram) in two queries on one connection.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
-            
+
+            # Expertise and availability ride along as JSON so the tutor row needs no follow-up queries
             query = """
                     SELECT
-                        t.tid, t.uid, t.rating, t.status, t.verificationStatus,
-                        u.firstName, u.lastName, u.email
+                        t.tid, t.uid, t.rating, t.ratingCount, t.status, t.verificationStatus,
+                        u.firstName, u.lastName, u.email, u.bio, u.profilePicture,
+                        (
+                            SELECT JSON_ARRAYAGG(JSON_OBJECT('id', tg.tagsID, 'name', tg.tags))
+                            FROM TutorTags tt
+                                     INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                            WHERE tt.tid = t.tid
+                        ) AS expertise,
+                        (
+                            SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                                'availabilityID', ta.availabilityID, 'tid', ta.tid, 'day', ta.day,
+                                'startTime', ta.startTime, 'endTime', ta.endTime, 'isActive', ta.isActive
+                            ))
+                            FROM TutorAvailability ta
+                            WHERE ta.tid = t.tid AND ta.isActive = TRUE
+                        ) AS availability,
+                        (
+                            SELECT JSON_OBJECTAGG(h.bucket, h.bucketCount)
+                            FROM RatingHistogram h
+                            WHERE h.tid = t.tid
+                        ) AS histogram
                     FROM Tutor t
                              INNER JOIN User u ON t.uid = u.uid
-                    WHERE t.uid = %s
+                    WHERE t.tid = %s
                     """
-            cursor.execute(query, (uid,))
+            cursor.execute(query, (tid,))
             tutor = cursor.fetchone()
 
-            if tutor:
-                return {
-                    'tid': tutor['tid'],
-                    'uid': tutor['uid'],
-                    'name': f"{tutor['firstName']} {tutor['lastName']}",
-                    'email': tutor['email'],
-                    'rating': tutor['rating'],
-                    'status': tutor['status'],
-                    'verificationStatus': tutor['verificationStatus']
-                }
+            if not tutor:
+                return None
 
-            return None
+            posts_query = """
+                          SELECT p.pid, p.tid, p.tagsID, p.content, p.timestamp, tg.tags AS course
+                          FROM Posts p
+                                   INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+                          WHERE p.tid = %s
+                          ORDER BY p.timestamp DESC
+                          LIMIT %s
+                          """
+            cursor.execute(posts_query, (tid, post_limit))
+            posts = cursor.fetchall()
+
+            expertise = json.loads(tutor['expertise']) if tutor['expertise'] else []
+            expertise.sort(key=lambda tag: tag['name'])
+
+            availability = json.loads(tutor['availability']) if tutor['availability'] else []
+            availability.sort(key=lambda slot: (WEEK_DAYS.index(slot['day']), slot['startTime']))
+
+            return {
+                'tid': tutor['tid'],
+                'uid': tutor['uid'],
+                'name': f"{tutor['firstName']} {tutor['lastName']}",
+                'email': tutor['email'],
+                'bio': tutor['bio'],
+                'profilePicture': tutor['profilePicture'],
+                'rating': tutor['rating'],
+                'status': tutor['status'],
+                'verificationStatus': tutor['verificationStatus'],
+                'expertise': expertise,
+                'posts': [{
+                    'pid': post['pid'],
+                    'tid': post['tid'],
+                    'course': post['course'],
+                    'tagsID': post['tagsID'],
+                    'content': post['content'],
+                    'timestamp': post['timestamp'].isoformat() if isinstance(post['timestamp'], datetime) else str(post['timestamp'])
+                } for post in posts],
+                'availability': availability,
+                'ratingStats': {
+                    'average': float(tutor['rating']),
+                    'count': tutor['ratingCount'],
+                    'histogram': rating_histogram({
+                        int(bucket): count for bucket, count in json.loads(tutor['histogram'] or '{}').items()
+                    })
+                }
+            }
 
         except Exception as e:
-            logger.error(f"Get tutor by uid error: {e}", exc_info=True)
+            logger.error(f"Get tutor profile error: {e}", exc_info=True)
             return None
         finally:
             if cursor:
@@ -270,87 +652,105 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
-    def get_all_tutors(self) -> List[Dict[str, Any]]:
+    def _select_listing(self, fields: List[str]) -> str:
+        """SELECT ... FROM for the tutor listing, joining User only when a User column is projected"""
+        columns = ['t.tid', 't.listingRank', 't.rating']
+        for field in fields:
+            columns.extend(c for c in LISTING_COLUMNS.get(field, ()) if c not in columns)
+
+        query = f"SELECT {', '.join(columns)} FROM Tutor t"
+        if any(c.startswith('u.') for c in columns):
+            query += " INNER JOIN User u ON t.uid = u.uid"
+        return query
+
+    def _tags_by_tutor(self, cursor, tutor_ids: Optional[List[int]] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Tags for the given tutors keyed by tid, each list sorted by tag name. None reads
+        every tutor's tags with a plain join; use it for whole-table loads instead of an
+        IN list over every tid.
+        """
+        tags_query = """
+                     SELECT tt.tid, tg.tagsID, tg.tags
+                     FROM TutorTags tt
+                              INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
+                     """
+        if tutor_ids is not None:
+            tags_query += " WHERE tt.tid IN (%s)" % ','.join(['%s'] * len(tutor_ids))
+        tags_query += " ORDER BY tt.tid, tg.tags"
+        cursor.execute(tags_query, tutor_ids or ())
+
+        tags_by_tutor: Dict[int, List[Dict[str, Any]]] = {}
+        for tag in cursor.fetchall():
+            tags_by_tutor.setdefault(tag['tid'], []).append({
+                'id': tag['tagsID'],
+                'name': tag['tags']
+            })
+        return tags_by_tutor
+
+    @staticmethod
+    def _listing_document(tutor: Dict[str, Any], fields: List[str], tags_by_tutor: Dict[int, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        document = {'tid': tutor['tid']}
+        for field in fields:
+            if field == 'name':
+                document['name'] = f"{tutor['firstName']} {tutor['lastName']}"
+            elif field == 'rating':
+                document['rating'] = float(tutor['rating'])
+            elif field == 'tags':
+                document['tags'] = tags_by_tutor.get(tutor['tid'], [])
+            elif field != 'tid':
+                document[field] = tutor[field]
+        return document
+
+    @staticmethod
+    def parse_listing_fields(fields: Optional[str]) -> List[str]:
+        """Validate a comma-separated fields= projection; None means every field"""
+        if not fields:
+            return list(LISTING_FIELDS)
+
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        invalid = [f for f in requested if f not in LISTING_FIELDS]
+        if invalid:
+            raise ValueError(f"Unknown fields: {', '.join(invalid)}. Valid fields: {', '.join(LISTING_FIELDS)}")
+        return [f for f in LISTING_FIELDS if f in requested]
+
+    @staticmethod
+    def encode_listing_cursor(tutor: Dict[str, Any]) -> str:
+        key = json.dumps([tutor['listingRank'], float(tutor['rating']), tutor['tid']])
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_listing_cursor(cursor: str) -> tuple:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            rank, rating, tid = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return int(rank), float(rating), int(tid)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def get_all_tutors(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Return **all** tutors in the system with their tags included.
-        Optimized to fetch all tutor-tag relationships in a single query.
+        Return **all** tutors in listing order (approved first, then by rating),
+        projected to fields when given. Prefer get_tutors_page for anything user facing.
         """
+        fields = fields or list(LISTING_FIELDS)
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
-            # First, get all tutors
-            query = """
-                    SELECT
-                        t.tid,
-                        u.firstName,
-                        u.lastName,
-                        u.email,
-                        u.bio,
-                        COALESCE(t.rating, 0) AS rating,
-                        t.status,
-                        t.verificationStatus
-                    FROM Tutor t
-                             INNER JOIN User u ON t.uid = u.uid
-                    ORDER BY
-                        CASE
-                            WHEN t.verificationStatus = 'approved' THEN 0
-                            WHEN t.verificationStatus = 'pending' THEN 1
-                            ELSE 2
-                            END,
-                        rating DESC,
-                        t.tid ASC
-                    """
+            query = self._select_listing(fields) + " ORDER BY t.listingRank, t.rating DESC, t.tid"
             cursor.execute(query)
             tutors = cursor.fetchall()
 
             if not tutors:
                 return []
 
-            # Get all tutor IDs
-            tutor_ids = [t['tid'] for t in tutors]
-
-            # Fetch all tags for all tutors in a single query
-            tags_query = """
-                         SELECT tt.tid, tg.tagsID, tg.tags
-                         FROM TutorTags tt
-                                  INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
-                         WHERE tt.tid IN (%s)
-                         ORDER BY tt.tid, tg.tags
-                         """ % ','.join(['%s'] * len(tutor_ids))
-
-            cursor.execute(tags_query, tutor_ids)
-            all_tags = cursor.fetchall()
-
-            # Group tags by tutor ID
             tags_by_tutor = {}
-            for tag in all_tags:
-                tid = tag['tid']
-                if tid not in tags_by_tutor:
-                    tags_by_tutor[tid] = []
-                tags_by_tutor[tid].append({
-                    'id': tag['tagsID'],
-                    'name': tag['tags']
-                })
-
-            # Build results with tags included
-            results: List[Dict[str, Any]] = []
-            for tutor in tutors:
-                tid = tutor['tid']
-                results.append({
-                    'tid': tid,
-                    'name': f"{tutor['firstName']} {tutor['lastName']}",
-                    'email': tutor['email'],
-                    'bio': tutor['bio'],
-                    'rating': float(tutor['rating']) if tutor['rating'] is not None else 0.0,
-                    'status': tutor['status'],
-                    'verificationStatus': tutor['verificationStatus'],
-                    'tags': tags_by_tutor.get(tid, [])
-                })
+            if 'tags' in fields:
+                tags_by_tutor = self._tags_by_tutor(cursor)
 
-            return results
+            return [self._listing_document(tutor, fields, tags_by_tutor) for tutor in tutors]
 
         except Exception as e:
             logger.error(f"Get all tutors error: {e}", exc_info=True)
@@ -361,93 +761,169 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
-    def get_top_tutors(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """
-        Return top tutors with their tags included.
-        Optimized to fetch all tutor-tag relationships in a single query.
-        """
+    def _listing_page_statement(self, limit: int, after: Optional[str], fields: List[str], tags_id: Optional[int] = None) -> Tuple[str, Tuple[Any, ...]]:
+        """Keyset page query for the tutor listing; raises ValueError on a bad cursor"""
+        conditions = []
+        params: List[Any] = []
+        query = self._select_listing(fields)
+
+        if after:
+            rank, rating, tid = self.decode_listing_cursor(after)
+            conditions.append("""(t.listingRank > %s
+                        OR (t.listingRank = %s AND t.rating < %s)
+                        OR (t.listingRank = %s AND t.rating = %s AND t.tid > %s))""")
+            params.extend([rank, rank, rating, rank, rating, tid])
+
+        if tags_id is not None:
+            conditions.append("EXISTS (SELECT 1 FROM TutorTags tt WHERE tt.tid = t.tid AND tt.tagsID = %s)")
+            params.append(tags_id)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        # One extra row tells us whether another page exists
+        query += " ORDER BY t.listingRank, t.rating DESC, t.tid LIMIT %s"
+        params.append(limit + 1)
+        return query, tuple(params)
+
+    def _load_listing_page(self, query: str, params: Tuple[Any, ...], limit: int, fields: List[str]) -> Dict[str, Any]:
+        """Run a listing page query on a pooled connection, released before returning; raises on error"""
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
-            
-            # First, get top tutors
-            query = """
-                    SELECT
-                        t.tid,
-                        u.firstName,
-                        u.lastName,
-                        u.email,
-                        u.bio,
-                        COALESCE(t.rating, 0) AS rating,
-                        t.status,
-                        t.verificationStatus
-                    FROM Tutor t
-                             INNER JOIN User u ON t.uid = u.uid
-                    ORDER BY
-                        CASE
-                            WHEN t.verificationStatus = 'approved' THEN 0
-                            WHEN t.verificationStatus = 'pending' THEN 1
-                            ELSE 2
-                            END,
-                        rating DESC,
-                        t.tid ASC
-                        LIMIT %s
-                    """
-            cursor.execute(query, (limit,))
-            tutors = cursor.fetchall()
-
-            if not tutors:
-                return []
 
-            # Get all tutor IDs
-            tutor_ids = [t['tid'] for t in tutors]
+            cursor.execute(query, params)
+            tutors = cursor.fetchall()
 
-            # Fetch all tags for these tutors in a single query
-            tags_query = """
-                         SELECT tt.tid, tg.tagsID, tg.tags
-                         FROM TutorTags tt
-                                  INNER JOIN Tags tg ON tt.tagsID = tg.tagsID
-                         WHERE tt.tid IN (%s)
-                         ORDER BY tt.tid, tg.tags
-                         """ % ','.join(['%s'] * len(tutor_ids))
-        
-            cursor.execute(tags_query, tutor_ids)
-            all_tags = cursor.fetchall()
+            has_more = len(tutors) > limit
+            tutors = tutors[:limit]
 
-            # Group tags by tutor ID
             tags_by_tutor = {}
-            for tag in all_tags:
-                tid = tag['tid']
-                if tid not in tags_by_tutor:
-                    tags_by_tutor[tid] = []
-                tags_by_tutor[tid].append({
-                    'id': tag['tagsID'],
-                    'name': tag['tags']
-                })
+            if tutors and 'tags' in fields:
+                tags_by_tutor = self._tags_by_tutor(cursor, [t['tid'] for t in tutors])
 
-            # Build results with tags included
-            results: List[Dict[str, Any]] = []
-            for tutor in tutors:
-                tid = tutor['tid']
-                results.append({
-                    'tid': tid,
-                    'name': f"{tutor['firstName']} {tutor['lastName']}",
-                    'email': tutor['email'],
-                    'bio': tutor['bio'],
-                    'rating': float(tutor['rating']) if tutor['rating'] is not None else 0.0,
-                    'status': tutor['status'],
-                    'verificationStatus': tutor['verificationStatus'],
-                    'tags': tags_by_tutor.get(tid, [])
-                })
+            return {
+                'tutors': [self._listing_document(tutor, fields, tags_by_tutor) for tutor in tutors],
+                'nextCursor': self.encode_listing_cursor(tutors[-1]) if has_more else None
+            }
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
 
-            return results
+    def get_tutors_page(
+            self,
+            limit: int = 20,
+            after: Optional[str] = None,
+            fields: Optional[List[str]] = None,
+            tags_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        One page of the tutor listing, keyset-paginated on (listingRank, rating DESC, tid)
+        so every page is a range scan of idx_tutor_listing. Pass the returned nextCursor
+        as after to continue; it is None on the last page. tags_id keeps only tutors with
+        that course in their expertise; keep passing it with the cursor. Raises ValueError
+        on a bad cursor.
+        """
+        fields = fields or list(LISTING_FIELDS)
+        query, params = self._listing_page_statement(limit, after, fields, tags_id)
 
+        try:
+            return self._load_listing_page(query, params, limit, fields)
         except Exception as e:
-            logger.error(f"Get top tutors error: {e}", exc_info=True)
+            logger.error(f"Get tutors page error: {e}", exc_info=True)
+            return None
+
+    def iter_all_tutors(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every tutor in get_all_tutors order, LISTING_STREAM_BATCH tutors per
+        keyset page. Each page holds a pool connection only while it loads, so a slow
+        client never pins one; errors are raised for the stream to report.
+        """
+        fields = list(LISTING_FIELDS)
+        after = None
+        while True:
+            query, params = self._listing_page_statement(LISTING_STREAM_BATCH, after, fields)
+            try:
+                page = self._load_listing_page(query, params, LISTING_STREAM_BATCH, fields)
+            except Exception as e:
+                logger.error(f"Stream all tutors error: {e}", exc_info=True)
+                raise
+
+            yield from page['tutors']
+
+            after = page['nextCursor']
+            if not after:
+                return
+
+    def get_top_tutors(self, limit: int = 50, tags_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return top tutors (overall, or for one course) with their tags included,
+        served from the in-memory leaderboard. Until the first reconcile loads it,
+        the same ranking is read as one LIMITed page of idx_tutor_listing.
+        """
+        if not self.leaderboard.loaded:
+            page = self.get_tutors_page(limit, tags_id=tags_id)
+            return page['tutors'] if page else []
+        return self.leaderboard.top(limit, tags_id)
+
+    def get_similar_tutors(self, tid: int, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Approved tutors whose expertise overlaps tid's most (Jaccard over tags),
+        read from the precomputed neighbor lists and hydrated through the tutor cache.
+        """
+        if not self.similarity.loaded:
+            # The reconcile task builds the index at startup; never block a request on it
             return []
+
+        neighbors = self.similarity.neighbors(tid)
+        tutors = self.get_tutors([neighbor_tid for neighbor_tid, _ in neighbors])
+
+        results = []
+        for neighbor_tid, score in neighbors:
+            tutor = tutors.get(neighbor_tid)
+            if tutor and tutor['verificationStatus'] == 'approved':
+                results.append({**tutor, 'similarity': score})
+                if len(results) == limit:
+                    break
+        return results
+
+    def reconcile_leaderboard(self) -> bool:
+        """
+        Rebuild the leaderboard and sync the similarity index from MySQL; run
+        periodically so every worker converges
+        """
+        fields = list(LISTING_FIELDS)
+        conn = None
+        cursor = None
+        try:
+            self.leaderboard.begin_reconcile()
+            self.similarity.begin_sync()
+
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            cursor.execute(self._select_listing(fields))
+            tutors = cursor.fetchall()
+
+            tags_by_tutor = self._tags_by_tutor(cursor)
+
+            self.leaderboard.reconcile([self._listing_document(tutor, fields, tags_by_tutor) for tutor in tutors])
+            self.similarity.sync({
+                tutor['tid']: [tag['id'] for tag in tags_by_tutor.get(tutor['tid'], [])]
+                for tutor in tutors
+            })
+            return True
+
+        except Exception as e:
+            logger.error(f"Reconcile leaderboard error: {e}", exc_info=True)
+            return False
         finally:
+            self.leaderboard.end_reconcile()
+            self.similarity.end_sync()
             if cursor:
                 cursor.close()
             if conn:
@@ -482,15 +958,50 @@ class GatorGuidesTutors:
                 )
                 return None
 
+            # Lock the tutor row so concurrent ratings serialize on the stored aggregates
+            tutor_query = """
+                          SELECT COALESCE(rating, 0) AS rating, ratingSum, ratingCount, verificationStatus
+                          FROM Tutor
+                          WHERE tid = %s
+                          FOR UPDATE
+                          """
+            cursor.execute(tutor_query, (tid,))
+            tutor = cursor.fetchone()
+            if not tutor:
+                logger.error(f"Tutor {tid} does not exist")
+                return None
+
             query = """
                     INSERT INTO Ratings (tid, uid, sid, rating, timestamp)
                     VALUES (%s, %s, %s, %s, NOW())
                     """
             cursor.execute(query, (tid, uid, sid, rating))
-            conn.commit()
             rating_id = cursor.lastrowid
 
-            self.update_tutor_rating(tid)
+            rating_sum = tutor['ratingSum'] + rating
+            rating_count = tutor['ratingCount'] + 1
+            avg_rating = round(rating_sum / rating_count, 2)
+
+            update_query = """
+                           UPDATE Tutor
+                           SET ratingSum = %s, ratingCount = %s, rating = %s
+                           WHERE tid = %s
+                           """
+            cursor.execute(update_query, (rating_sum, rating_count, avg_rating, tid))
+
+            histogram_query = """
+                              INSERT INTO RatingHistogram (tid, bucket, bucketCount)
+                              VALUES (%s, %s, 1)
+                              ON DUPLICATE KEY UPDATE bucketCount = bucketCount + 1
+                              """
+            cursor.execute(histogram_query, (tid, rating_bucket(rating)))
+
+            if tutor['verificationStatus'] == 'approved':
+                adjust_tutor_courses(cursor, tid, 0, avg_rating - tutor['rating'])
+
+            conn.commit()
+            self.cache.update(tid, rating=avg_rating)
+            self.leaderboard.update(tid, rating=avg_rating)
 
             return {
                 'rid': rating_id,
@@ -517,6 +1028,45 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
+    def get_rating_summary(self, tid: int) -> Optional[Dict[str, Any]]:
+        """Count, mean and half-star histogram from the stored aggregates, never scanning Ratings"""
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            query = """
+                    SELECT t.ratingSum, t.ratingCount, h.bucket, h.bucketCount
+                    FROM Tutor t
+                             LEFT JOIN RatingHistogram h ON h.tid = t.tid
+                    WHERE t.tid = %s
+                    """
+            cursor.execute(query, (tid,))
+            rows = cursor.fetchall()
+
+            if not rows:
+                return None
+
+            count = rows[0]['ratingCount']
+            return {
+                'tid': tid,
+                'count': count,
+                'mean': round(float(rows[0]['ratingSum']) / count, 2) if count > 0 else 0.0,
+                'histogram': rating_histogram({
+                    row['bucket']: row['bucketCount'] for row in rows if row['bucket'] is not None
+                })
+            }
+
+        except Exception as e:
+            logger.error(f"Get rating summary error: {e}", exc_info=True)
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
     def get_tutor_rating_count(self, tid: int) -> int:
         conn = None
         cursor = None
@@ -524,11 +1074,11 @@ class GatorGuidesTutors:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
-            query = "SELECT COUNT(*) AS count FROM Ratings WHERE tid = %s"
+            query = "SELECT ratingCount FROM Tutor WHERE tid = %s"
             cursor.execute(query, (tid,))
             result = cursor.fetchone()
             
-            return result['count'] if result else 0
+            return result['ratingCount'] if result else 0
 
         except Exception as e:
             logger.error(f"Get rating count error: {e}", exc_info=True)
@@ -570,14 +1120,18 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
-    def get_pending_tutors(self) -> List[Dict[str, Any]]:
+    def get_pending_tutors(self, limit: Optional[int] = None, after_tid: Optional[int] = None, tags_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Pending tutors in tid order, read off idx_tutor_verification_tid. Pass limit and
+        the last tid seen as after_tid to page through the queue; tags_id keeps only
+        applicants for that course.
+        """
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor(dictionary=True)
             
-            # Get all pending tutors
             query = """
                     SELECT
                         t.tid,
@@ -593,9 +1147,22 @@ class GatorGuidesTutors:
                     FROM Tutor t
                              INNER JOIN User u ON t.uid = u.uid
                     WHERE t.verificationStatus = 'pending'
-                    ORDER BY t.tid ASC
                     """
-            cursor.execute(query)
+            params: List[Any] = []
+
+            if after_tid is not None:
+                query += " AND t.tid > %s"
+                params.append(after_tid)
+            if tags_id is not None:
+                query += " AND EXISTS (SELECT 1 FROM TutorTags tt WHERE tt.tid = t.tid AND tt.tagsID = %s)"
+                params.append(tags_id)
+
+            query += " ORDER BY t.tid ASC"
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit)
+
+            cursor.execute(query, tuple(params))
             tutors = cursor.fetchall()
 
             if not tutors:
@@ -654,6 +1221,36 @@ class GatorGuidesTutors:
             if conn:
                 conn.close()
 
+    def count_pending_tutors(self, tags_id: Optional[int] = None) -> int:
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            if tags_id is None:
+                cursor.execute("SELECT COUNT(*) AS total FROM Tutor WHERE verificationStatus = 'pending'")
+            else:
+                query = """
+                        SELECT COUNT(*) AS total
+                        FROM TutorTags tt
+                                 INNER JOIN Tutor t ON t.tid = tt.tid
+                        WHERE tt.tagsID = %s AND t.verificationStatus = 'pending'
+                        """
+                cursor.execute(query, (tags_id,))
+            result = cursor.fetchone()
+
+            return result['total'] if result else 0
+
+        except Exception as e:
+            logger.error(f"Count pending tutors error: {e}", exc_info=True)
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
     def reject_tutor(self, tid: int) -> bool:
         conn = None
         cursor = None
@@ -681,6 +1278,9 @@ class GatorGuidesTutors:
             rowcount = cursor.rowcount
             
             if rowcount > 0:
+                self.cache.update(tid, verificationStatus='unapproved')
+                self.leaderboard.update(tid, verificationStatus='unapproved')
+                GatorGuidesPosts.invalidate_feed()
                 logger.info(f"Tutor {tid} rejected (status set to unapproved)")
                 return True
             
@@ -705,7 +1305,7 @@ class GatorGuidesTutors:
             cursor = conn.cursor(dictionary=True)
             
             # Check current status
-            check_query = "SELECT verificationStatus FROM Tutor WHERE tid = %s"
+            check_query = "SELECT verificationStatus, COALESCE(rating, 0) AS rating FROM Tutor WHERE tid = %s FOR UPDATE"
             cursor.execute(check_query, (tid,))
             tutor = cursor.fetchone()
             
@@ -720,10 +1320,15 @@ class GatorGuidesTutors:
             # Update to approved
             update_query = "UPDATE Tutor SET verificationStatus = 'approved' WHERE tid = %s"
             cursor.execute(update_query, (tid,))
-            conn.commit()
             rowcount = cursor.rowcount
+            if rowcount > 0:
+                adjust_tutor_courses(cursor, tid, 1, tutor['rating'])
+            conn.commit()
             
             if rowcount > 0:
+                self.cache.update(tid, verificationStatus='approved')
+                self.leaderboard.update(tid, verificationStatus='approved')
+                GatorGuidesPosts.invalidate_feed()
                 logger.info(f"Tutor {tid} accepted (status set to approved)")
                 return True
             
@@ -738,4 +1343,69 @@ class GatorGuidesTutors:
             if cursor:
                 cursor.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def review_tutors(self, tids: List[int], approve: bool) -> Optional[List[Dict[str, Any]]]:
+        """
+        Approve or reject many pending tutors in one transaction. Returns one outcome
+        per tid: 'approved'/'rejected', 'not_pending' (with its current status) or 'not_found'.
+        """
+        tids = list(dict.fromkeys(tids))
+        new_status = 'approved' if approve else 'unapproved'
+        placeholders = ','.join(['%s'] * len(tids))
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(dictionary=True)
+
+            cursor.execute(
+                f"SELECT tid, verificationStatus FROM Tutor WHERE tid IN ({placeholders}) FOR UPDATE",
+                tuple(tids)
+            )
+            current = {row['tid']: row['verificationStatus'] for row in cursor.fetchall()}
+            pending = [tid for tid in tids if current.get(tid) == 'pending']
+
+            if pending:
+                cursor.execute(
+                    f"""
+                    UPDATE Tutor SET verificationStatus = %s
+                    WHERE tid IN ({','.join(['%s'] * len(pending))}) AND verificationStatus = 'pending'
+                    """,
+                    (new_status, *pending)
+                )
+                if approve:
+                    adjust_courses_for_tutors(cursor, pending, 1)
+
+            conn.commit()
+
+            for tid in pending:
+                self.cache.update(tid, verificationStatus=new_status)
+                self.leaderboard.update(tid, verificationStatus=new_status)
+            if pending:
+                GatorGuidesPosts.invalidate_feed()
+
+            results = []
+            for tid in tids:
+                if tid not in current:
+                    results.append({'tid': tid, 'outcome': 'not_found'})
+                elif current[tid] != 'pending':
+                    results.append({'tid': tid, 'outcome': 'not_pending', 'verificationStatus': current[tid]})
+                else:
+                    results.append({
+                        'tid': tid,
+                        'outcome': 'approved' if approve else 'rejected',
+                        'verificationStatus': new_status
+                    })
+            return results
+
+        except Exception as e:
+            logger.error(f"Review tutors error: {e}", exc_info=True)
+            if conn:
+                conn.rollback()
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
@@ -2,6 +2,7 @@ from typing import Optional, Dict, Any
 import bcrypt
 import logging
 from db.Auth import ConnectionPool
+from db.TutorCache import TutorCache
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,7 @@ logger = logging.getLogger(__name__)
 class GatorGuidesUsers:
     def __init__(self):
         self.pool = ConnectionPool()
+        self.tutor_cache = TutorCache()
     
     def _get_connection(self):
         return self.pool.get_connection()
@@ -192,6 +194,9 @@ class GatorGuidesUsers:
             cursor.execute(query, tuple(values))
             conn.commit()
             rowcount = cursor.rowcount
+
+            # Name, bio and picture are part of the cached tutor record
+            self.tutor_cache.invalidate_uid(uid)
             
             return rowcount > 0
 
@@ -0,0 +1,16 @@
+# Indexes backing the faceted /api/search filters
+USE GatorGuides;
+
+CREATE TABLE IF NOT EXISTS SchemaVersion
+(
+    version   INT PRIMARY KEY,
+    appliedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE Tutor
+    ADD INDEX idx_tutor_verification_rating (verificationStatus, rating);
+
+ALTER TABLE TutorTags
+    ADD INDEX idx_tutortags_tag (tagsID, tid);
+
+INSERT INTO SchemaVersion (version) VALUES (1);
@@ -0,0 +1,27 @@
+# Precomputed per-course browse counters for /api/browse/courses
+USE GatorGuides;
+
+CREATE TABLE CourseStats
+(
+    tagsID     INT PRIMARY KEY,
+    tutorCount INT    NOT NULL DEFAULT 0,
+    postCount  INT    NOT NULL DEFAULT 0,
+    ratingSum  DOUBLE NOT NULL DEFAULT 0,
+    FOREIGN KEY (tagsID) REFERENCES Tags (tagsID) ON DELETE CASCADE
+);
+
+INSERT INTO CourseStats (tagsID, tutorCount, postCount, ratingSum)
+SELECT
+    tg.tagsID,
+    (SELECT COUNT(*)
+     FROM TutorTags tt
+              INNER JOIN Tutor t ON tt.tid = t.tid
+     WHERE tt.tagsID = tg.tagsID AND t.verificationStatus = 'approved'),
+    (SELECT COUNT(*) FROM Posts p WHERE p.tagsID = tg.tagsID),
+    (SELECT COALESCE(SUM(COALESCE(t.rating, 0)), 0)
+     FROM TutorTags tt
+              INNER JOIN Tutor t ON tt.tid = t.tid
+     WHERE tt.tagsID = tg.tagsID AND t.verificationStatus = 'approved')
+FROM Tags tg;
+
+INSERT INTO SchemaVersion (version) VALUES (2);
@@ -0,0 +1,15 @@
+# Stored rating aggregates on Tutor, maintained in the create_rating transaction
+USE GatorGuides;
+
+ALTER TABLE Tutor
+    ADD COLUMN ratingSum   DOUBLE NOT NULL DEFAULT 0 AFTER rating,
+    ADD COLUMN ratingCount INT    NOT NULL DEFAULT 0 AFTER ratingSum;
+
+UPDATE Tutor t
+    INNER JOIN (SELECT tid, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+                FROM Ratings
+                GROUP BY tid) r ON r.tid = t.tid
+SET t.ratingSum   = r.rating_sum,
+    t.ratingCount = r.rating_count;
+
+INSERT INTO SchemaVersion (version) VALUES (3);
@@ -0,0 +1,14 @@
+# Index-friendly sort key for the keyset-paginated /api/tutors listing
+USE GatorGuides;
+
+UPDATE Tutor SET rating = 0 WHERE rating IS NULL;
+
+ALTER TABLE Tutor
+    MODIFY COLUMN rating DOUBLE NOT NULL DEFAULT 0,
+    ADD COLUMN listingRank TINYINT AS (CASE verificationStatus
+                                           WHEN 'approved' THEN 0
+                                           WHEN 'pending' THEN 1
+                                           ELSE 2 END) STORED AFTER verificationStatus,
+    ADD INDEX idx_tutor_listing (listingRank, rating DESC, tid);
+
+INSERT INTO SchemaVersion (version) VALUES (4);
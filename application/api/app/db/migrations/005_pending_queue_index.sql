@@ -0,0 +1,7 @@
+# Index backing the keyset-paginated pending tutor queue and its count
+USE GatorGuides;
+
+ALTER TABLE Tutor
+    ADD INDEX idx_tutor_verification_tid (verificationStatus, tid);
+
+INSERT INTO SchemaVersion (version) VALUES (5);
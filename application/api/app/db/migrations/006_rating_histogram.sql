@@ -0,0 +1,18 @@
+# Per-tutor half-star rating histogram, maintained in the create_rating transaction
+USE GatorGuides;
+
+CREATE TABLE RatingHistogram
+(
+    tid         INT     NOT NULL,
+    bucket      TINYINT NOT NULL,
+    bucketCount INT     NOT NULL DEFAULT 0,
+    PRIMARY KEY (tid, bucket),
+    FOREIGN KEY (tid) REFERENCES Tutor (tid) ON DELETE CASCADE
+);
+
+INSERT INTO RatingHistogram (tid, bucket, bucketCount)
+SELECT tid, FLOOR(rating * 2), COUNT(*)
+FROM Ratings
+GROUP BY tid, FLOOR(rating * 2);
+
+INSERT INTO SchemaVersion (version) VALUES (6);
@@ -0,0 +1,7 @@
+# Index backing the keyset-paginated global post feed
+USE GatorGuides;
+
+ALTER TABLE Posts
+    ADD INDEX idx_posts_feed (timestamp, pid);
+
+INSERT INTO SchemaVersion (version) VALUES (7);
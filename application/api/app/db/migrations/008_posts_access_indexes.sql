@@ -0,0 +1,8 @@
+# Indexes for per-tutor and per-course post listings, both newest first
+USE GatorGuides;
+
+ALTER TABLE Posts
+    ADD INDEX idx_posts_tid_timestamp (tid, timestamp),
+    ADD INDEX idx_posts_tag_timestamp (tagsID, timestamp);
+
+INSERT INTO SchemaVersion (version) VALUES (8);
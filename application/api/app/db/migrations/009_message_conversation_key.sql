@@ -0,0 +1,9 @@
+# Canonical conversation key so a conversation is one index range instead of an OR of two pairs
+USE GatorGuides;
+
+ALTER TABLE Messages
+    ADD COLUMN convKey BIGINT AS (LEAST(senderUID, receiverUID) * 4294967296
+                                  + GREATEST(senderUID, receiverUID)) STORED AFTER receiverUID,
+    ADD INDEX idx_messages_conversation (convKey, mid);
+
+INSERT INTO SchemaVersion (version) VALUES (9);
@@ -0,0 +1,33 @@
+# Per-user conversation summaries so the inbox is one index range instead of a scan of all messages
+USE GatorGuides;
+
+CREATE TABLE Conversations
+(
+    uid           INT          NOT NULL,
+    otherUID      INT          NOT NULL,
+    lastMID       INT          NOT NULL,
+    lastSenderUID INT          NOT NULL,
+    lastContent   VARCHAR(200) NOT NULL,
+    lastTimestamp DATETIME     NOT NULL,
+    unreadCount   INT          NOT NULL DEFAULT 0,
+    PRIMARY KEY (uid, otherUID),
+    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE,
+    FOREIGN KEY (otherUID) REFERENCES User (uid) ON DELETE CASCADE,
+    INDEX idx_conversations_inbox (uid, lastMID)
+);
+
+# No read state existed before this table, so history starts out read
+INSERT INTO Conversations (uid, otherUID, lastMID, lastSenderUID, lastContent, lastTimestamp, unreadCount)
+SELECT last.uid, last.otherUID, m.mid, m.senderUID, LEFT(m.content, 200), m.timestamp, 0
+FROM (
+    SELECT sides.uid, sides.otherUID, MAX(sides.mid) AS mid
+    FROM (
+        SELECT senderUID AS uid, receiverUID AS otherUID, mid FROM Messages
+        UNION ALL
+        SELECT receiverUID AS uid, senderUID AS otherUID, mid FROM Messages
+    ) sides
+    GROUP BY sides.uid, sides.otherUID
+) last
+INNER JOIN Messages m ON m.mid = last.mid;
+
+INSERT INTO SchemaVersion (version) VALUES (10);
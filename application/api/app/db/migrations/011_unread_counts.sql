@@ -0,0 +1,23 @@
+# Read positions per conversation side and a per-user unread total for the inbox badge
+USE GatorGuides;
+
+ALTER TABLE Conversations
+    ADD COLUMN lastReadMID INT NOT NULL DEFAULT 0 AFTER unreadCount;
+
+# History carried over from 010 starts out read
+UPDATE Conversations SET lastReadMID = lastMID WHERE unreadCount = 0;
+
+CREATE TABLE UnreadCounts
+(
+    uid   INT PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (uid) REFERENCES User (uid) ON DELETE CASCADE
+);
+
+INSERT INTO UnreadCounts (uid, total)
+SELECT uid, SUM(unreadCount)
+FROM Conversations
+GROUP BY uid
+HAVING SUM(unreadCount) > 0;
+
+INSERT INTO SchemaVersion (version) VALUES (11);
@@ -0,0 +1,10 @@
+# Drop the implicit single-column foreign key indexes on Posts; idx_posts_tid_timestamp and
+# idx_posts_tag_timestamp lead with the same columns and back the foreign keys from migration 008 on.
+# Fresh installs from Schema.sql never create them.
+USE GatorGuides;
+
+ALTER TABLE Posts
+    DROP INDEX tid,
+    DROP INDEX tagsID;
+
+INSERT INTO SchemaVersion (version) VALUES (12);
@@ -6,6 +6,7 @@ from db.Sessions import GatorGuidesSessions
 from db.Tutors import GatorGuidesTutors
 from db.Users import GatorGuidesUsers
 from db.Availability import GatorGuidesAvailability
+from core.loaders import TutorLoader
 
 _auth_manager_instance = None
 _session_manager_instance = None
@@ -68,6 +69,9 @@ def get_tutors_manager() -> GatorGuidesTutors:
         raise RuntimeError("Tutors manager not initialized")
     return _tutors_manager_instance
 
+def get_tutor_loader() -> TutorLoader:
+    return TutorLoader(get_tutors_manager())
+
 def get_posts_manager() -> GatorGuidesPosts:
     if not _posts_manager_instance:
         raise RuntimeError("Posts manager not initialized")
@@ -0,0 +1,131 @@
+import re
+import sys
+import random
+from datetime import datetime, timedelta
+from db.Auth import ConnectionPool
+from db.Posts import GatorGuidesPosts, FEED_PAGE_SIZE
+from db.Search import GatorGuidesSearch
+from core.config import settings
+
+# Synthetic posts inserted with --seed are tagged with this content and removed afterwards
+SEED_MARKER = "explain-seed"
+SEED_BATCH = 10000
+
+# Matches a Sort node in an EXPLAIN FORMAT=TREE plan that orders Posts (alias p) rows,
+# whether for ORDER BY, a window, or a per-tutor LIMIT such as search's newest posts
+POSTS_SORT = re.compile(r"-> Sort[^\n]*\bp\.")
+
+def plans(sample):
+    """(name, (query, params), indexes the plan should use on Posts) built by the real managers"""
+    posts = GatorGuidesPosts()
+    search = GatorGuidesSearch()
+    return [
+        ("get_posts_by_tutor", posts._tutor_posts_statement(sample['tid'], 50), ["idx_posts_tid_timestamp"]),
+        ("feed by course", posts._feed_statement(FEED_PAGE_SIZE, tags_id=sample['tagsID']), ["idx_posts_tag_timestamp"]),
+        ("feed", posts._feed_statement(FEED_PAGE_SIZE), ["idx_posts_feed"]),
+        ("search", search._search_statement(sample['course']), ["idx_posts_tag_timestamp", "idx_posts_tid_timestamp"]),
+    ]
+
+def seed_posts(conn, count):
+    cursor = conn.cursor()
+    cursor.execute("SELECT tid FROM Tutor")
+    tids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT tagsID FROM Tags")
+    tag_ids = [row[0] for row in cursor.fetchall()]
+
+    if not tids or not tag_ids:
+        print("✗ Need at least one tutor and one tag to seed posts")
+        cursor.close()
+        return
+
+    print(f"\nSeeding {count} posts...")
+    now = datetime.now()
+    query = "INSERT INTO Posts (tid, tagsID, content, timestamp) VALUES (%s, %s, %s, %s)"
+    for start in range(0, count, SEED_BATCH):
+        rows = [
+            (random.choice(tids), random.choice(tag_ids), SEED_MARKER, now - timedelta(minutes=random.randint(0, 525600)))
+            for _ in range(min(SEED_BATCH, count - start))
+        ]
+        cursor.executemany(query, rows)
+        conn.commit()
+
+    cursor.execute("ANALYZE TABLE Posts")
+    cursor.fetchall()
+    cursor.close()
+
+def remove_seed(conn):
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM Posts WHERE content = %s", (SEED_MARKER,))
+    conn.commit()
+    print(f"\nRemoved {cursor.rowcount} seeded posts")
+    cursor.close()
+
+def check_plan(cursor, name, statement, expected_indexes):
+    query, params = statement
+    cursor.execute("EXPLAIN FORMAT=TREE " + query, params)
+    plan = "\n".join(row['EXPLAIN'] for row in cursor.fetchall())
+
+    missing = [index for index in expected_indexes if f"on p using {index}" not in plan]
+    sorts = [line.strip() for line in plan.splitlines() if POSTS_SORT.search(line)]
+    ok = not missing and not sorts
+
+    print(f"  {'✓' if ok else '✗'} {name}")
+    for index in missing:
+        print(f"      index not used: {index}")
+    for line in sorts:
+        print(f"      sorts Posts: {line}")
+    if not ok:
+        print("\n".join("      | " + line for line in plan.splitlines()))
+    return ok
+
+def main():
+    print("\n" + "="*50)
+    print("   GatorGuides Posts Query Plans")
+    print("="*50)
+
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+
+    pool = ConnectionPool()
+    pool.initialize(
+        host=settings.DATABASE_HOST,
+        database=settings.DATABASE_NAME,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        pool_size=2
+    )
+    conn = pool.get_connection()
+
+    try:
+        if seed:
+            seed_posts(conn, seed)
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT COUNT(*) AS posts FROM Posts")
+        print(f"\nPosts: {cursor.fetchone()['posts']}")
+
+        cursor.execute("""
+            SELECT p.tid, p.tagsID, tg.tags AS course
+            FROM Posts p
+            INNER JOIN Tags tg ON p.tagsID = tg.tagsID
+            ORDER BY p.pid
+            LIMIT 1
+        """)
+        sample = cursor.fetchone() or {'tid': 1, 'tagsID': 1, 'course': 'csc'}
+
+        results = [
+            check_plan(cursor, name, statement, indexes)
+            for name, statement, indexes in plans(sample)
+        ]
+        cursor.close()
+
+        print(f"\n{sum(results)}/{len(results)} plans use their indexes without sorting Posts")
+    finally:
+        if seed:
+            remove_seed(conn)
+        conn.close()
+        pool.close_all()
+
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
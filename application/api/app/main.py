@@ -10,6 +10,10 @@ from db.Posts import GatorGuidesPosts
 from db.Messages import GatorGuidesMessages
 from db.Search import GatorGuidesSearch
 from db.Availability import GatorGuidesAvailability
+from db.Leaderboard import LEADERBOARD_RECONCILE_SECONDS
+from db.Presence import PresenceTracker, PRESENCE_FLUSH_SECONDS
+from db.ReadReceipts import ReadReceipts, READ_FLUSH_SECONDS
+from core.similarity import SIMILARITY_APPLY_SECONDS
 from dependencies import (
     set_auth_manager_instance, 
     set_session_manager_instance, 
@@ -49,6 +53,62 @@ async def cleanup_sessions_task():
             logger.error(f"Session cleanup error: {e}", exc_info=True)
 
 
+async def reconcile_leaderboard_task(tutors_manager: GatorGuidesTutors):
+    while True:
+        try:
+            # Load first so the board is warm shortly after startup, then keep it converged
+            await asyncio.to_thread(tutors_manager.reconcile_leaderboard)
+            await asyncio.sleep(LEADERBOARD_RECONCILE_SECONDS)
+            
+        except asyncio.CancelledError:
+            logger.info("Leaderboard reconcile task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Leaderboard reconcile error: {e}", exc_info=True)
+
+
+async def apply_similarity_task(tutors_manager: GatorGuidesTutors):
+    while True:
+        try:
+            await asyncio.sleep(SIMILARITY_APPLY_SECONDS)
+            await asyncio.to_thread(tutors_manager.similarity.apply_pending)
+            
+        except asyncio.CancelledError:
+            logger.info("Similarity apply task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Similarity apply error: {e}", exc_info=True)
+
+
+async def flush_read_receipts_task():
+    receipts = ReadReceipts()
+    while True:
+        try:
+            await asyncio.sleep(READ_FLUSH_SECONDS)
+            await asyncio.to_thread(receipts.flush)
+            
+        except asyncio.CancelledError:
+            logger.info("Read receipts flush task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Read receipts flush error: {e}", exc_info=True)
+
+
+async def flush_presence_task():
+    presence = PresenceTracker()
+    while True:
+        try:
+            await asyncio.sleep(PRESENCE_FLUSH_SECONDS)
+            presence.sweep()
+            await asyncio.to_thread(presence.flush)
+            
+        except asyncio.CancelledError:
+            logger.info("Presence flush task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Presence flush error: {e}", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global auth_manager_instance, session_manager_instance
@@ -57,6 +117,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting GatorGuides API...")
     
     cleanup_task = None
+    leaderboard_task = None
+    similarity_task = None
+    presence_task = None
+    receipts_task = None
     
     try:
         pool = ConnectionPool()
@@ -94,6 +158,18 @@ async def lifespan(app: FastAPI):
 
         cleanup_task = asyncio.create_task(cleanup_sessions_task())
         logger.info("Session cleanup task started")
+
+        leaderboard_task = asyncio.create_task(reconcile_leaderboard_task(tutors_manager))
+        logger.info("Leaderboard reconcile task started")
+
+        similarity_task = asyncio.create_task(apply_similarity_task(tutors_manager))
+        logger.info("Similarity apply task started")
+
+        presence_task = asyncio.create_task(flush_presence_task())
+        logger.info("Presence flush task started")
+
+        receipts_task = asyncio.create_task(flush_read_receipts_task())
+        logger.info("Read receipts flush task started")
         
     except Exception as e:
         logger.error(f"Startup failed: {e}", exc_info=True)
@@ -105,12 +181,17 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down GatorGuides API...")
     
     try:
-        if cleanup_task:
-            cleanup_task.cancel()
-            try:
-                await cleanup_task
-            except asyncio.CancelledError:
-                pass
+        for task in (cleanup_task, leaderboard_task, similarity_task, presence_task, receipts_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        # Write out presence changes and read receipts made since the last flush
+        PresenceTracker().flush()
+        ReadReceipts().flush()
         
         cleaner.stop()
         logger.info("Connection cleaner stopped")
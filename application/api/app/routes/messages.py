@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Header
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dependencies import get_auth_manager, get_messages_manager
 from db.Messages import GatorGuidesMessages
 from db.Auth import GatorGuidesAuth
+from db.Presence import PresenceTracker
+from db.ReadReceipts import ReadReceipts
 import logging
 import json
 import time
@@ -21,18 +23,30 @@ class SendMessageRequest(BaseModel):
     receiverUID: int = Field(..., description="Receiver user ID")
     content: str = Field(..., min_length=1, max_length=5000, description="Message content")
 
+class MarkReadRequest(BaseModel):
+    otherUID: int = Field(..., description="The other user in the conversation")
+    mid: int = Field(..., ge=1, description="Newest message ID the reader has seen")
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[int, WebSocket] = {}
+        # A user may have the messages page open in several tabs, one socket each
+        self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.presence = PresenceTracker()
 
     async def connect(self, user_id: int, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        self.active_connections.setdefault(user_id, []).append(websocket)
+        self.presence.connected(user_id)
         logger.info(f"User {user_id} connected via WebSocket")
 
-    def disconnect(self, user_id: int):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+    def disconnect(self, user_id: int, websocket: WebSocket):
+        sockets = self.active_connections.get(user_id, [])
+        if websocket in sockets:
+            sockets.remove(websocket)
+            if not sockets:
+                # Last open socket for this user
+                del self.active_connections[user_id]
+                self.presence.disconnected(user_id)
             logger.info(f"User {user_id} disconnected")
 
     async def send_personal_message(self, message: Dict[str, Any], user_id: int, messages_mgr: GatorGuidesMessages) -> bool:
@@ -45,14 +59,17 @@ class ConnectionManager:
                     logger.warning(f"Blocked WebSocket message delivery: {sender_uid} -> {receiver_uid} (no session)")
                     return False
             
-            try:
-                await self.active_connections[user_id].send_json(message)
+            delivered = False
+            for websocket in list(self.active_connections.get(user_id, [])):
+                try:
+                    await websocket.send_json(message)
+                    delivered = True
+                except Exception as e:
+                    logger.error(f"Failed to send message to user {user_id}: {e}")
+                    self.disconnect(user_id, websocket)
+            if delivered:
                 logger.info(f"Sent message to user {user_id}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to send message to user {user_id}: {e}")
-                self.disconnect(user_id)
-                return False
+            return delivered
         return False
 
     def is_online(self, user_id: int) -> bool:
@@ -121,6 +138,9 @@ async def send_message(request: SendMessageRequest, current_user: int = Depends(
                 detail="You can only send messages as yourself"
             )
         
+        if request.receiverUID == request.senderUID:
+            raise HTTPException(status_code=400, detail="You cannot send a message to yourself")
+        
         if not check_rate_limit(current_user):
             raise HTTPException(
                 status_code=429,
@@ -155,9 +175,17 @@ async def send_message(request: SendMessageRequest, current_user: int = Depends(
         logger.error(f"Send message error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Get conversation between two users
+# Get conversation between two users; pass before_mid (oldest mid loaded) to page back through history
 @router.get("/messages/{uid1}/{uid2}", response_model=List[Dict[str, Any]])
-async def get_conversation(uid1: int, uid2: int, limit: int = 50, offset: int = 0, current_user: int = Depends(get_current_user), messages_mgr: GatorGuidesMessages = Depends(get_messages_manager)):
+async def get_conversation(
+    uid1: int,
+    uid2: int,
+    limit: int = 50,
+    offset: int = 0,
+    before_mid: Optional[int] = Query(None, description="Only messages older than this mid"),
+    current_user: int = Depends(get_current_user),
+    messages_mgr: GatorGuidesMessages = Depends(get_messages_manager)
+):
     try:
         if current_user not in [uid1, uid2]:
             raise HTTPException(
@@ -165,7 +193,7 @@ async def get_conversation(uid1: int, uid2: int, limit: int = 50, offset: int =
                 detail="You can only view your own conversations"
             )
         
-        messages = messages_mgr.get_conversation(uid1, uid2, limit, offset)
+        messages = messages_mgr.get_conversation(uid1, uid2, limit, offset, before_mid)
         return messages
     except HTTPException:
         raise
@@ -173,6 +201,40 @@ async def get_conversation(uid1: int, uid2: int, limit: int = 50, offset: int =
         logger.error(f"Get conversation error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Mark a conversation read up to a message; applied in the next batched flush
+@router.post("/messages/read", response_model=Dict[str, Any])
+async def mark_read(request: MarkReadRequest, current_user: int = Depends(get_current_user)):
+    try:
+        ReadReceipts().acknowledge(current_user, request.otherUID, request.mid)
+        return {
+            "otherUID": request.otherUID,
+            "mid": request.mid,
+            "queued": True
+        }
+    except Exception as e:
+        logger.error(f"Mark read error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Total unread messages for the inbox badge
+@router.get("/users/{uid}/unread", response_model=Dict[str, Any])
+async def get_unread_total(uid: int, current_user: int = Depends(get_current_user), messages_mgr: GatorGuidesMessages = Depends(get_messages_manager)):
+    try:
+        if current_user != uid:
+            raise HTTPException(
+                status_code=403,
+                detail="You can only view your own unread count"
+            )
+
+        return {
+            "uid": uid,
+            "unread": messages_mgr.get_unread_total(uid)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get unread total error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Get message history for recent conversations
 @router.get("/users/{uid}/conversations", response_model=List[Dict[str, Any]])
 async def get_recent_conversations(uid: int, limit: int = 20, current_user: int = Depends(get_current_user), messages_mgr: GatorGuidesMessages = Depends(get_messages_manager)):
@@ -208,11 +270,12 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int, token: str = No
             data = await websocket.receive_text()
             
             if data == "ping":
+                manager.presence.heartbeat(user_id)
                 await websocket.send_text("pong")
             
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
+        manager.disconnect(user_id, websocket)
         logger.info(f"WebSocket disconnected for user {user_id}")
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
-        manager.disconnect(user_id)
\ No newline at end of file
+        manager.disconnect(user_id, websocket)
\ No newline at end of file
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from dependencies import get_auth_manager, get_tutors_manager, get_posts_manager
-from db.Posts import GatorGuidesPosts
+from db.Posts import GatorGuidesPosts, FEED_PAGE_SIZE
 from db.Tutors import GatorGuidesTutors
 from db.Auth import GatorGuidesAuth
 import logging
@@ -34,6 +34,27 @@ async def get_current_user(authorization: str = Header(None), auth_mgr: GatorGui
     
     return uid
 
+# Newest posts from approved tutors across all courses; pass cursor to page and tagsID to filter by course
+@router.get("/posts/feed", response_model=Dict[str, Any])
+async def get_feed(
+    limit: int = Query(FEED_PAGE_SIZE, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    tagsID: Optional[int] = Query(None, description="Only posts for this course"),
+    posts_mgr: GatorGuidesPosts = Depends(get_posts_manager)
+):
+    try:
+        page = posts_mgr.get_feed(limit=limit, after=cursor, tags_id=tagsID)
+        if page is None:
+            raise HTTPException(status_code=500, detail="Failed to load feed")
+        return page
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Get feed error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Get single post by ID
 @router.get("/posts/{pid}", response_model=Dict[str, Any])
 async def get_post(pid: int, posts_mgr: GatorGuidesPosts = Depends(get_posts_manager)):
@@ -61,7 +82,7 @@ async def get_tutor_posts(tid: int, limit: int = 50, posts_mgr: GatorGuidesPosts
         logger.error(f"Get tutor posts error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Creates post after verifying tutor and tag exist
+# Creates post after verifying the caller owns the tutor profile; the tag is checked by its FK
 @router.post("/posts", response_model=Dict[str, Any])
 async def create_post(request: CreatePostRequest, current_user: int = Depends(get_current_user), posts_mgr: GatorGuidesPosts = Depends(get_posts_manager), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
     try:
@@ -96,44 +117,36 @@ async def create_post(request: CreatePostRequest, current_user: int = Depends(ge
         logger.error(f"Create post error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Update post tags and contents
+# Update post tags and contents; ownership is enforced by the update itself
 @router.put("/posts/{pid}", response_model=Dict[str, Any])
-async def update_post(pid: int, request: UpdatePostRequest, current_user: int = Depends(get_current_user), posts_mgr: GatorGuidesPosts = Depends(get_posts_manager), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+async def update_post(pid: int, request: UpdatePostRequest, current_user: int = Depends(get_current_user), posts_mgr: GatorGuidesPosts = Depends(get_posts_manager)):
     try:
-        tid = posts_mgr.get_tutor_id_from_post(pid)
-        
-        if not tid:
-            raise HTTPException(status_code=404, detail="Post not found")
-        
-        tutor = tutors_mgr.get_tutor(tid)
-        
-        if not tutor:
-            raise HTTPException(status_code=404, detail="Tutor not found")
-        
-        # Verify current user owns this profile
-        if current_user != tutor['uid']:
-            raise HTTPException(
-                status_code=403,
-                detail="You can only update your own posts"
-            )
-        
-        # Update the post
-        success = posts_mgr.update_post(
+        if request.content is None and request.tagsID is None:
+            raise HTTPException(status_code=400, detail="Update failed. No fields were changed.")
+
+        outcome = posts_mgr.update_own_post(
             pid=pid,
+            uid=current_user,
             content=request.content,
             tags_id=request.tagsID
         )
-        
-        if success:
-            # Get updated post
-            post = posts_mgr.get_post(pid)
-            logger.info(f"Post updated: PID {pid}")
-            return post
-        else:
+
+        if outcome == 'not_found':
+            raise HTTPException(status_code=404, detail="Post not found")
+        if outcome == 'forbidden':
             raise HTTPException(
-                status_code=400,
-                detail="Update failed. Post may not exist or no fields were changed."
+                status_code=403,
+                detail="You can only update your own posts"
             )
+        if outcome == 'invalid_tag':
+            raise HTTPException(status_code=400, detail="Course tag does not exist")
+        if outcome is None:
+            raise HTTPException(status_code=500, detail="Failed to update post")
+
+        # Get updated post
+        post = posts_mgr.get_post(pid)
+        logger.info(f"Post updated: PID {pid}")
+        return post
     
     except HTTPException:
         raise
@@ -141,38 +154,26 @@ async def update_post(pid: int, request: UpdatePostRequest, current_user: int =
         logger.error(f"Update post error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Delete post
+# Delete post; ownership is enforced by the delete itself
 @router.delete("/posts/{pid}", response_model=Dict[str, Any])
-async def delete_post(pid: int, current_user: int = Depends(get_current_user), posts_mgr: GatorGuidesPosts = Depends(get_posts_manager), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+async def delete_post(pid: int, current_user: int = Depends(get_current_user), posts_mgr: GatorGuidesPosts = Depends(get_posts_manager)):
     try:
-        tid = posts_mgr.get_tutor_id_from_post(pid)
-        
-        if not tid:
-            raise HTTPException(status_code=404, detail="Post not found")
-        
-        tutor = tutors_mgr.get_tutor(tid)
-        
-        if not tutor:
-            raise HTTPException(status_code=404, detail="Tutor not found")
-        
-        # Verify current user owns this profile
-        if current_user != tutor['uid']:
+        outcome = posts_mgr.delete_own_post(pid, current_user)
+
+        if outcome == 'deleted':
+            logger.info(f"Post deleted: PID {pid}")
+            return {"message": "Post deleted successfully", "pid": pid}
+        if outcome == 'forbidden':
             raise HTTPException(
                 status_code=403,
                 detail="You can only delete your own posts"
             )
-        
-        # Delete the post
-        success = posts_mgr.delete_post(pid)
-        
-        if success:
-            logger.info(f"Post deleted: PID {pid}")
-            return {"message": "Post deleted successfully", "pid": pid}
-        else:
+        if outcome == 'not_found':
             raise HTTPException(status_code=404, detail="Post not found")
+        raise HTTPException(status_code=500, detail="Failed to delete post")
     
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Delete post error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,30 +1,143 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
-from dependencies import get_search_manager
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Union
+from dependencies import get_search_manager, get_auth_manager, get_users_manager
 from db.Search import GatorGuidesSearch
+from db.Users import GatorGuidesUsers
+from db.Auth import GatorGuidesAuth
+from core.streaming import ndjson_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Searches for tutors based on tags and names
-@router.get("/search", response_model=List[Dict[str, Any]])
-@router.get("/search/{query}", response_model=List[Dict[str, Any]])
-async def search(query: str = "", search_db: GatorGuidesSearch = Depends(get_search_manager)):
+# Tags change about once a semester; clients revalidate with If-None-Match after this
+TAGS_CACHE_CONTROL = "public, max-age=3600"
+
+class CreateTagRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=8, description="Course tag, e.g. 'CSC 210'")
+
+async def get_current_user(authorization: str = Header(None), auth_mgr: GatorGuidesAuth = Depends(get_auth_manager)) -> int:
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Invalid authentication format")
+    
+    session_id = authorization.replace("Bearer ", "")
+    uid = auth_mgr.validate_session(session_id)
+    
+    if not uid:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    
+    return uid
+
+async def get_current_admin(current_user: int = Depends(get_current_user), users_mgr: GatorGuidesUsers = Depends(get_users_manager)) -> int:
+    user = users_mgr.get_user(current_user)
+    
+    if not user or user['type'] != 'admin':
+        raise HTTPException(
+            status_code=403,
+            detail="Admin access required"
+        )
+    
+    return current_user
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+# Searches for tutors based on tags and names, optionally filtered by facets
+@router.get("/search", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+@router.get("/search/{query}", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+async def search(
+    query: str = "",
+    min_rating: Optional[float] = Query(None, ge=0.0, le=5.0, description="Minimum tutor rating"),
+    status: Optional[List[str]] = Query(None, description="'available', 'away', or 'busy' (repeatable)"),
+    tagsID: Optional[List[int]] = Query(None, description="Course tag IDs in the tutor's expertise (repeatable)"),
+    day: Optional[str] = Query(None, description="Tutor available on this day"),
+    hour: Optional[int] = Query(None, ge=0, le=23, description="Tutor available at this hour"),
+    sort: str = Query("relevance", description="'relevance' (weighted score) or 'rating' (tag hits first)"),
+    facets: bool = Query(False, description="Return {results, facets} with per-facet counts"),
+    stream: bool = Query(False, description="Stream unranked results as newline-delimited JSON"),
+    search_db: GatorGuidesSearch = Depends(get_search_manager)
+):
     try:
+        if sort not in ("relevance", "rating"):
+            raise HTTPException(status_code=400, detail="sort must be 'relevance' or 'rating'")
+
         search_query = query.strip() if query else ""
-        results = search_db.search(search_query)
+        filters = {
+            "min_rating": min_rating,
+            "statuses": status,
+            "tag_ids": tagsID,
+            "day": day,
+            "hour": hour
+        }
+
+        if stream:
+            return ndjson_response(search_db.iter_search(search_query, **filters))
+
+        results = search_db.search(search_query, ranked=(sort == "relevance"), **filters)
+
+        if facets:
+            return {
+                "results": results,
+                "facets": search_db.search_facets(search_query, **filters)
+            }
         return results
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Search error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Returns all available courses in the database
+# Returns all available courses from the cached catalog, 304 when the client copy is current
 @router.get("/tags", response_model=List[Dict[str, Any]])
-async def get_all_tags(search_db: GatorGuidesSearch = Depends(get_search_manager)):
+async def get_all_tags(if_none_match: Optional[str] = Header(None), search_db: GatorGuidesSearch = Depends(get_search_manager)):
     try:
-        tags = search_db.get_all_tags()
-        return tags
+        catalog = search_db.get_tag_catalog()
+        headers = {"Cache-Control": TAGS_CACHE_CONTROL}
+        if catalog['etag']:
+            headers["ETag"] = catalog['etag']
+            headers["X-Tags-Version"] = str(catalog['version'])
+
+        if etag_matches(if_none_match, catalog['etag']):
+            return Response(status_code=304, headers=headers)
+
+        return JSONResponse(content=catalog['tags'], headers=headers)
     except Exception as e:
         logger.error(f"Get tags error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Returns every course with approved tutor count, post count and average tutor rating
+@router.get("/browse/courses", response_model=List[Dict[str, Any]])
+async def browse_courses(search_db: GatorGuidesSearch = Depends(get_search_manager)):
+    try:
+        return search_db.get_course_stats()
+    except Exception as e:
+        logger.error(f"Browse courses error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Add a course tag (admin only) and invalidate the cached catalog
+@router.post("/tags", response_model=Dict[str, Any])
+async def create_tag(request: CreateTagRequest, current_admin: int = Depends(get_current_admin), search_db: GatorGuidesSearch = Depends(get_search_manager)):
+    try:
+        tag = search_db.create_tag(request.name.strip())
+
+        if tag:
+            logger.info(f"Admin {current_admin} created tag {tag['id']} ({tag['name']})")
+            return tag
+        else:
+            raise HTTPException(status_code=400, detail="Failed to create tag. It may already exist.")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Create tag error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Literal
-from dependencies import get_auth_manager, get_session_manager, get_messages_manager
+from dependencies import get_auth_manager, get_session_manager, get_messages_manager, get_tutor_loader
 from db.Sessions import GatorGuidesSessions
 from db.Auth import GatorGuidesAuth
 from db.Messages import GatorGuidesMessages
+from core.loaders import TutorLoader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -221,9 +222,14 @@ async def cancel_session(
         logger.error(f"Cancel session error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Gets all sessions for a specific student
+# Gets all sessions for a specific student, each with its tutor's profile picture and expertise
 @router.get("/users/{uid}/sessions", response_model=List[Dict[str, Any]])
-async def get_user_sessions(uid: int, current_user: int = Depends(get_current_user), session_mgr: GatorGuidesSessions = Depends(get_session_manager)):
+async def get_user_sessions(
+    uid: int,
+    current_user: int = Depends(get_current_user),
+    session_mgr: GatorGuidesSessions = Depends(get_session_manager),
+    tutor_loader: TutorLoader = Depends(get_tutor_loader)
+):
     try:
         if current_user != uid:
             raise HTTPException(
@@ -232,6 +238,14 @@ async def get_user_sessions(uid: int, current_user: int = Depends(get_current_us
             )
         
         sessions = session_mgr.get_user_sessions(uid)
+
+        # Every session's tutor is fetched in one batch instead of one lookup per row
+        tutor_loader.queue(session['tid'] for session in sessions if session['tid'])
+        for session in sessions:
+            profile = tutor_loader.get(session['tid']) if session['tid'] else None
+            session['tutor']['profilePicture'] = profile['profilePicture'] if profile else None
+            session['tutor']['expertise'] = profile['expertise'] if profile else []
+
         return sessions
             
     except HTTPException:
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
-from dependencies import get_auth_manager, get_users_manager, get_tutors_manager
+from typing import List, Dict, Any, Optional, Union
+from dependencies import get_auth_manager, get_users_manager, get_tutors_manager, get_tutor_loader
 from db.Tutors import GatorGuidesTutors
 from db.Users import GatorGuidesUsers
 from db.Auth import GatorGuidesAuth
+from core.streaming import ndjson_response
+from core.loaders import TutorLoader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,10 @@ class CreateTutorRequest(BaseModel):
 class UpdateVerificationRequest(BaseModel):
     status: str = Field(..., description="'unapproved', 'pending', or 'approved'")
 
+class ReviewTutorsRequest(BaseModel):
+    tids: List[int] = Field(..., min_length=1, max_length=500, description="Pending tutor IDs")
+    action: str = Field(..., description="'approve' or 'reject'")
+
 class AddTagsRequest(BaseModel):
     tagIds: List[int] = Field(..., description="List of tag IDs for tutor expertise")
 
@@ -60,28 +66,124 @@ async def get_current_admin(current_user: int = Depends(get_current_user), users
     
     return current_user
 
-# Returns top 10 tutors based on ratings
+# Returns top tutors (10 by default, optionally for one course) from the in-memory leaderboard
 @router.get("/tutors/top", response_model=List[Dict[str, Any]])
-async def get_top_tutors(tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+async def get_top_tutors(
+        limit: int = Query(10, ge=1, le=50),
+        tagsID: Optional[int] = Query(None, description="Only tutors with this course in their expertise"),
+        tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)
+):
     try:
-        results = tutors_mgr.get_top_tutors(limit=10)
+        results = tutors_mgr.get_top_tutors(limit=limit, tags_id=tagsID)
         return results
     except Exception as e:
         logger.error(f"Top tutors error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-# Get **ALL** tutors (for student dashboard "Available Tutors" list)
-@router.get("/tutors", response_model=List[Dict[str, Any]])
+# Tutor cache size and hit rate (admin only)
+@router.get("/tutors/cache/stats", response_model=Dict[str, Any])
+async def get_tutor_cache_stats(current_admin: int = Depends(get_current_admin), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+    try:
+        return tutors_mgr.cache_stats()
+    except Exception as e:
+        logger.error(f"Tutor cache stats error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Get tutors for the student dashboard "Available Tutors" list; pass limit/cursor to page, tagsID to filter by course and fields to project
+@router.get("/tutors", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
 async def get_all_tutors(
+        limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; returns {tutors, nextCursor}"),
+        cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+        fields: Optional[str] = Query(None, description="Comma-separated projection, e.g. 'name,rating,tags'"),
+        tagsID: Optional[int] = Query(None, description="Only tutors with this course in their expertise; returns a page"),
+        stream: bool = Query(False, description="Stream tutors as newline-delimited JSON"),
         tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)
 ):
     try:
-        results = tutors_mgr.get_all_tutors()
+        if stream:
+            return ndjson_response(tutors_mgr.iter_all_tutors())
+
+        projection = tutors_mgr.parse_listing_fields(fields)
+
+        if limit is not None or cursor is not None or tagsID is not None:
+            page = tutors_mgr.get_tutors_page(limit or 20, cursor, projection, tagsID)
+            if page is None:
+                raise HTTPException(status_code=500, detail="Failed to load tutors")
+            return page
+
+        results = tutors_mgr.get_all_tutors(projection)
         return results
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get all tutors error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Get pending tutors; pass limit/cursor to page through the queue and tagsID to filter by course
+@router.get("/tutors/pending", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+async def get_pending_tutors(
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; returns {tutors, nextCursor}"),
+    cursor: Optional[int] = Query(None, description="nextCursor from the previous page"),
+    tagsID: Optional[int] = Query(None, description="Only applicants for this course"),
+    current_admin: int = Depends(get_current_admin),
+    tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)
+):
+    try:
+        if limit is None and cursor is None:
+            results = tutors_mgr.get_pending_tutors(tags_id=tagsID)
+            logger.info(f"Admin {current_admin} retrieved {len(results)} pending tutors")
+            return results
+
+        page_size = limit or 20
+        results = tutors_mgr.get_pending_tutors(limit=page_size + 1, after_tid=cursor, tags_id=tagsID)
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        return {
+            "tutors": results,
+            "nextCursor": results[-1]['tid'] if has_more else None
+        }
+    except Exception as e:
+        logger.error(f"Get pending tutors error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Count pending tutors, optionally for one course
+@router.get("/tutors/pending/count", response_model=Dict[str, Any])
+async def count_pending_tutors(
+    tagsID: Optional[int] = Query(None, description="Only applicants for this course"),
+    current_admin: int = Depends(get_current_admin),
+    tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)
+):
+    try:
+        return {
+            "pending": tutors_mgr.count_pending_tutors(tagsID),
+            "tagsID": tagsID
+        }
+    except Exception as e:
+        logger.error(f"Count pending tutors error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Get many tutors at once for list views, in the order requested
+@router.get("/tutors/batch", response_model=List[Dict[str, Any]])
+async def get_tutors_batch(
+        ids: List[str] = Query(..., description="Tutor IDs (repeatable or comma-separated)"),
+        tutor_loader: TutorLoader = Depends(get_tutor_loader)
+):
+    try:
+        tids = [int(tid) for value in ids for tid in value.split(',') if tid.strip()]
+        if len(tids) > 100:
+            raise HTTPException(status_code=400, detail="At most 100 ids per request")
+
+        return tutor_loader.get_many(dict.fromkeys(tids))
+    except HTTPException:
+        raise
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    except Exception as e:
+        logger.error(f"Get tutors batch error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Get tutor by tutor ID
 @router.get("/tutors/{tid}", response_model=Dict[str, Any])
 async def get_tutor(tid: int, tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
@@ -99,6 +201,32 @@ async def get_tutor(tid: int, tutors_mgr: GatorGuidesTutors = Depends(get_tutors
         logger.error(f"Get tutor error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Get everything the tutor profile page needs in one call
+@router.get("/tutors/{tid}/profile", response_model=Dict[str, Any])
+async def get_tutor_profile(tid: int, post_limit: int = Query(10, ge=0, le=50), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+    try:
+        profile = tutors_mgr.get_tutor_profile(tid, post_limit)
+
+        if profile:
+            return profile
+        else:
+            raise HTTPException(status_code=404, detail="Tutor not found")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get tutor profile error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Get approved tutors with the most similar expertise
+@router.get("/tutors/{tid}/similar", response_model=List[Dict[str, Any]])
+async def get_similar_tutors(tid: int, limit: int = Query(5, ge=1, le=20), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+    try:
+        return tutors_mgr.get_similar_tutors(tid, limit)
+    except Exception as e:
+        logger.error(f"Get similar tutors error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Get tutor by user ID
 @router.get("/tutors/by-user/{uid}", response_model=Dict[str, Any])
 async def get_tutor_by_user_id(uid: int, tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
@@ -195,10 +323,47 @@ async def add_tutor_tags(tid: int, request: AddTagsRequest, current_user: int =
             
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Add tags error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     
+# Replace tutor tags, applying only the difference
+@router.put("/tutors/{tid}/tags", response_model=Dict[str, Any])
+async def set_tutor_tags(tid: int, request: AddTagsRequest, current_user: int = Depends(get_current_user), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+    try:
+        tutor = tutors_mgr.get_tutor(tid)
+        if not tutor:
+            raise HTTPException(status_code=404, detail="Tutor not found")
+        
+        if current_user != tutor['uid']:
+            raise HTTPException(
+                status_code=403,
+                detail="You can only change tags on your own tutor profile"
+            )
+        
+        result = tutors_mgr.set_tutor_tags(tid, request.tagIds)
+        
+        if result:
+            return {
+                "message": "Tags updated successfully",
+                **result
+            }
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to update tags. Tutor may not exist."
+            )
+            
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Set tags error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Submit tutor rating
 @router.post("/tutors/ratings", response_model=Dict[str, Any])
 async def create_rating(request: CreateRatingRequest, current_user: int = Depends(get_current_user),tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
@@ -241,6 +406,23 @@ async def get_rating_count(tid: int, tutors_mgr: GatorGuidesTutors = Depends(get
         logger.error(f"Get rating count error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Get rating count, mean and half-star histogram
+@router.get("/tutors/{tid}/ratings/summary", response_model=Dict[str, Any])
+async def get_rating_summary(tid: int, tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
+    try:
+        summary = tutors_mgr.get_rating_summary(tid)
+
+        if summary:
+            return summary
+        else:
+            raise HTTPException(status_code=404, detail="Tutor not found")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get rating summary error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Check if user can still rate a session
 @router.get("/sessions/{sid}/can-rate", response_model=Dict[str, Any])
 async def check_can_rate(sid: int, current_user: int = Depends(get_current_user), tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)):
@@ -402,21 +584,36 @@ async def get_available_times(tid: int, day: str):
         logger.error(f"Get available times error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     
-# Get all pending tutors
-@router.get("/tutors/pending", response_model=List[Dict[str, Any]])
-async def get_pending_tutors(
+# Approve or reject many tutor applications at once
+@router.post("/tutors/review", response_model=Dict[str, Any])
+async def review_tutors(
+    request: ReviewTutorsRequest,
     current_admin: int = Depends(get_current_admin),
     tutors_mgr: GatorGuidesTutors = Depends(get_tutors_manager)
 ):
     try:
-        results = tutors_mgr.get_pending_tutors()
-        logger.info(f"Admin {current_admin} retrieved {len(results)} pending tutors")
-        return results
+        if request.action not in ('approve', 'reject'):
+            raise HTTPException(status_code=400, detail="action must be 'approve' or 'reject'")
+
+        results = tutors_mgr.review_tutors(request.tids, approve=(request.action == 'approve'))
+
+        if results is None:
+            raise HTTPException(status_code=500, detail="Failed to review tutors")
+
+        updated = [r['tid'] for r in results if r['outcome'] in ('approved', 'rejected')]
+        logger.info(f"Admin {current_admin} {request.action}d tutors {updated}")
+        return {
+            "action": request.action,
+            "updated": len(updated),
+            "results": results
+        }
+            
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Get pending tutors error: {str(e)}", exc_info=True)
+        logger.error(f"Review tutors error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-
 # Reject tutor application
 @router.put("/tutors/{tid}/reject", response_model=Dict[str, Any])
 async def reject_tutor(
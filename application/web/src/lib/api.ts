@@ -45,12 +45,40 @@ export interface SearchResult {
 	courses: string[];
 }
 
-export async function searchTutors(query: string): Promise<SearchResult[]> {
-	const url =
+export interface SearchFilters {
+	minRating?: number;
+	status?: ('available' | 'away' | 'busy')[];
+	tagIds?: number[];
+	day?: string;
+	hour?: number;
+}
+
+export interface SearchFacets {
+	status: { [status: string]: number };
+	tags: { id: number; name: string; count: number }[];
+	minRating: { [threshold: string]: number };
+	total: number;
+}
+
+function searchUrl(query: string, filters: SearchFilters = {}, facets = false): string {
+	const base =
 		query && query.trim().length > 0
 			? `${API_BASE}/search/${encodeURIComponent(query.trim())}`
 			: `${API_BASE}/search`;
 
+	const params = new URLSearchParams();
+	if (filters.minRating !== undefined) params.set('min_rating', String(filters.minRating));
+	filters.status?.forEach((s) => params.append('status', s));
+	filters.tagIds?.forEach((id) => params.append('tagsID', String(id)));
+	if (filters.day) params.set('day', filters.day);
+	if (filters.hour !== undefined) params.set('hour', String(filters.hour));
+	if (facets) params.set('facets', 'true');
+
+	const qs = params.toString();
+	return qs ? `${base}?${qs}` : base;
+}
+
+async function fetchSearch<T>(url: string): Promise<T> {
 	const res = await fetch(url);
 	if (!res.ok) {
 		let msg = 'Search request failed';
@@ -66,6 +94,60 @@ export async function searchTutors(query: string): Promise<SearchResult[]> {
 	return res.json();
 }
 
+export async function searchTutors(
+	query: string,
+	filters: SearchFilters = {}
+): Promise<SearchResult[]> {
+	return fetchSearch<SearchResult[]>(searchUrl(query, filters));
+}
+
+export async function searchTutorsWithFacets(
+	query: string,
+	filters: SearchFilters = {}
+): Promise<{ results: SearchResult[]; facets: SearchFacets }> {
+	return fetchSearch(searchUrl(query, filters, true));
+}
+
+// Reads newline-delimited JSON and hands each tutor to onResult as soon as it arrives
+export async function streamSearchTutors(
+	query: string,
+	onResult: (result: SearchResult) => void,
+	filters: SearchFilters = {}
+): Promise<void> {
+	const url = searchUrl(query, filters);
+	const res = await fetch(url + (url.includes('?') ? '&' : '?') + 'stream=true');
+	if (!res.ok || !res.body) {
+		throw new Error('Search request failed');
+	}
+
+	const reader = res.body.getReader();
+	const decoder = new TextDecoder();
+	let buffered = '';
+
+	// The server ends a stream that failed part-way with a single {"error": ...} line
+	const handleLine = (line: string) => {
+		const item = JSON.parse(line);
+		if (item.error !== undefined && item.tid === undefined) {
+			throw new Error('Search results were interrupted. Please try again.');
+		}
+		onResult(item);
+	};
+
+	while (true) {
+		const { done, value } = await reader.read();
+		if (done) break;
+
+		buffered += decoder.decode(value, { stream: true });
+		const lines = buffered.split('\n');
+		buffered = lines.pop() ?? '';
+		for (const line of lines) {
+			if (line.trim()) handleLine(line);
+		}
+	}
+
+	if (buffered.trim()) handleLine(buffered);
+}
+
 /* ---------- AUTH & USERS ---------- */
 
 export interface User {
@@ -236,7 +318,12 @@ export const SESSION_LOCATIONS: SessionLocation[] = [
 export interface Session {
 	sid: number;
 	student: { uid: number; name: string };
-	tutor: { tid: number; name: string };
+	tutor: {
+		tid: number;
+		name: string;
+		profilePicture?: string | null;
+		expertise?: { id: number; name: string }[];
+	};
 	course: string;
 	day: string;
 	time: number;
@@ -337,6 +424,25 @@ export async function addTutorTags(
 	}
 }
 
+// Replace tutor's tags/subjects; only the difference is written
+export async function setTutorTags(
+	tid: number,
+	tagIds: number[]
+): Promise<{ tid: number; added: number[]; removed: number[] }> {
+	const response = await authFetch(`${API_BASE}/tutors/${tid}/tags`, {
+		method: 'PUT',
+		headers: { 'Content-Type': 'application/json' },
+		body: JSON.stringify({ tagIds })
+	});
+
+	if (!response.ok) {
+		const error = await response.json();
+		throw new Error(error.detail || 'Failed to update tutor tags');
+	}
+
+	return response.json();
+}
+
 export async function getTopTutors(): Promise<any[]> {
 	const res = await fetch(`${API_BASE}/tutors/top`);
 	if (!res.ok) {
@@ -536,6 +642,32 @@ export async function getPosts(tid: number): Promise<Post[]> {
 	return res.json();
 }
 
+export interface FeedPost extends Post {
+	tutorName: string;
+	rating: number;
+	course: string;
+}
+
+export interface FeedPage {
+	posts: FeedPost[];
+	nextCursor: string | null;
+}
+
+// Newest posts across all courses; pass the previous nextCursor to load more
+export async function getPostFeed(cursor?: string | null, tagsID?: number): Promise<FeedPage> {
+	const params = new URLSearchParams();
+	if (cursor) params.set('cursor', cursor);
+	if (tagsID !== undefined) params.set('tagsID', String(tagsID));
+	const res = await fetch(`${API_BASE}/posts/feed?${params}`);
+
+	if (!res.ok) {
+		console.error('Failed to fetch post feed');
+		return { posts: [], nextCursor: null };
+	}
+
+	return res.json();
+}
+
 export async function deletePost(pid: number): Promise<{ message: string; pid: number }> {
 	const res = await authFetch(`${API_BASE}/posts/${pid}`, {
 		method: 'DELETE'
@@ -609,6 +741,8 @@ export interface Conversation {
 	otherName: string;
 	lastMessage: string;
 	lastMessageTime: string;
+	unreadCount: number;
+	lastReadMID: number;
 }
 
 export interface SendMessagePayload {
@@ -649,15 +783,16 @@ export async function sendMessage(payload: SendMessagePayload): Promise<Message>
 	return res.json();
 }
 
-// Get conversation between two users
+// Get conversation between two users; pass the oldest loaded mid as beforeMid to load earlier history
 export async function getConversation(
 	uid1: number,
 	uid2: number,
 	limit: number = 50,
-	offset: number = 0
+	beforeMid?: number
 ): Promise<Message[]> {
+	const cursor = beforeMid !== undefined ? `&before_mid=${beforeMid}` : '';
 	const res = await authFetch(
-		`${API_BASE}/messages/${uid1}/${uid2}?limit=${limit}&offset=${offset}`
+		`${API_BASE}/messages/${uid1}/${uid2}?limit=${limit}${cursor}`
 	);
 	if (!res.ok) {
 		throw new Error('Failed to load conversation');
@@ -677,6 +812,28 @@ export async function getRecentConversations(
 	return res.json();
 }
 
+// Mark messages from otherUID read up to mid; the server applies acknowledgements in batches
+export async function markConversationRead(otherUID: number, mid: number): Promise<void> {
+	const res = await authFetch(`${API_BASE}/messages/read`, {
+		method: 'POST',
+		headers: { 'Content-Type': 'application/json' },
+		body: JSON.stringify({ otherUID, mid })
+	});
+	if (!res.ok) {
+		console.error('Failed to mark conversation read');
+	}
+}
+
+// Total unread messages for the inbox badge
+export async function getUnreadCount(uid: number): Promise<number> {
+	const res = await authFetch(`${API_BASE}/users/${uid}/unread`);
+	if (!res.ok) {
+		return 0;
+	}
+	const data = await res.json();
+	return data.unread;
+}
+
 // WebSocket connection helper
 export function createWebSocket(userId: number, token: string): WebSocket {
 	const isDevelopment =